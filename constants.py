@@ -1,7 +1,10 @@
 import os
+import importlib.util
 
 TIMEOUT = 5
 BASE_FILE_PATH = "tmp"
+QUERY_CACHE_PATH = "cache"
+QUERY_CACHE_MAX_BYTES = 256 * 1024 * 1024
 
 
 ### FILEBASE
@@ -9,6 +12,21 @@ AWS_ACCESS_KEY_ID = os.getenv("FILEBASE_KEY")
 AWS_SECRET_ACCESS_KEY = os.getenv("FILEBASE_SECRET")
 BUCKET = os.getenv("FILEBASE_BUCKET")
 S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+ARTIFACT_COMPRESSION = (os.getenv("ARTIFACT_COMPRESSION", "gzip") or "none").lower()
+if ARTIFACT_COMPRESSION == "none":
+    ARTIFACT_COMPRESSION = None
+elif ARTIFACT_COMPRESSION not in ("gzip", "zstd"):
+    print(f"Unsupported ARTIFACT_COMPRESSION '{ARTIFACT_COMPRESSION}', compressing artifacts with gzip...")
+    ARTIFACT_COMPRESSION = "gzip"
+# zstandard is optional, fall back to gzip when it is not installed
+if ARTIFACT_COMPRESSION == "zstd" and importlib.util.find_spec("zstandard") is None:
+    print("zstandard is not installed, compressing artifacts with gzip...")
+    ARTIFACT_COMPRESSION = "gzip"
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+ARCHIVE_FILE_NAME = "archive.bin"
+ARCHIVE_INDEX_FILE_NAME = "archive.index.json"
+LINKS_MANIFEST_KEY = "manifests/links_manifest.json"
+RUN_FINGERPRINTS_KEY = "manifests/run_fingerprints.json"
 
 ### MYSQL AIVEN
 
@@ -43,10 +61,19 @@ COLUMNS = [
 
 ### TMDB
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
-IMAGE_BASE_URL = "https://image.tmdb.org/t/p/original"
+IMAGE_BASE_URL = os.getenv("IMAGE_BASE_URL", "https://image.tmdb.org/t/p/original")
 MOVIE_URL = "https://www.themoviedb.org/movie/movie_id"
 
+### IMAGE MIRROR
+IMAGE_MIRROR_BASE_URL = os.getenv("IMAGE_MIRROR_BASE_URL")
+IMAGE_MIRROR_PREFIX = "images"
+IMAGE_VARIANT_WIDTHS = {"w185": 185, "w500": 500, "w1280": 1280}
+IMAGE_MIRROR_DEFAULT_VARIANT = "w500"
+IMAGE_MIRROR_MARKER = "variants.json"
+IMAGE_WORKERS = 8
+
 ### GOOGLE SHEETS
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 SPREADSHEET_ID = os.getenv("SPREADSHEET_ID")
-SHEET_NAME = os.getenv("SHEET_NAME")
\ No newline at end of file
+SHEET_NAME = os.getenv("SHEET_NAME")
+AGGREGATES_SHEET_NAME = os.getenv("AGGREGATES_SHEET_NAME", "aggregates")
\ No newline at end of file
@@ -1,9 +1,10 @@
 import filebase
 import mysqldb
 import tmdb
+import argparse
 
 
-def main(write_files_to_buckets=True):
+def main(write_files_to_buckets=True, force=False):
     """
     Connects to the MySQL database, fetches all movie genres from TMDb, and creates a table called 'genres' if it doesn't exist. If the table does exist, it will be dropped and recreated.
 
@@ -11,22 +12,39 @@ def main(write_files_to_buckets=True):
 
     If write_files_to_buckets is True, the function will upload the files to the buckets.
 
-    The function will then delete all objects in the specified S3 bucket that are older than 30 days, and delete all local files in the directory specified in constants.BASE_FILE_PATH and its subdirectories.
+    The function will then compact the folders of past days into indexed archives, delete all objects in the specified S3 bucket that are older than 30 days, and delete all local files in the directory specified in constants.BASE_FILE_PATH and its subdirectories.
+
+    Unless force is True, the function only runs the bucket housekeeping (compaction and the 30 day retention sweep) and exits if the genres are identical to the ones of the last successful run.
 
     :param write_files_to_buckets: A boolean indicating whether to write the files to the buckets
+    :param force: A boolean indicating whether to run in full even if the genres did not change
     :return: None
     """
+    data = tmdb.get_all_movie_genres()
+    fingerprint = filebase.get_fingerprint(sorted(data, key=lambda genre: genre["id"]))
+    if not force and filebase.is_unchanged_since_last_run("genres", fingerprint):
+        print("Nothing changed upstream, skipping the run...")
+        filebase.compact_past_days()
+        filebase.delete_folder_30days()
+        return None
+
     filebase.create_local_tmp()
     conn = mysqldb.get_mysql_conn()
-    data = tmdb.get_all_movie_genres()
     genre_table_data = mysqldb.generate_genres_table(conn, data)
     # print(genre_table_data)
     if write_files_to_buckets:
         filebase.upload_to_folder()
 
+    filebase.compact_past_days()
     filebase.delete_folder_30days()
     filebase.local_tmp_cleanup()
 
+    if genre_table_data:
+        filebase.save_run_fingerprint("genres", fingerprint, {"genre_count": len(data)})
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--force", action="store_true", help="run in full even if the genres did not change")
+    args = parser.parse_args()
+    main(force=args.force)
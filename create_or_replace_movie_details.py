@@ -1,10 +1,13 @@
 import mysqldb
 import tmdb
 import filebase
+import images
+import constants
 import os
+import argparse
 
 
-def main(write_files_to_buckets=True):
+def main(write_files_to_buckets=True, incremental=False, profile=False, time_budget_ms=None, mirror_images=False, force=False):
     """
     Main function to orchestrate the process of updating and managing movie details.
     This function performs the following steps:
@@ -13,33 +16,133 @@ def main(write_files_to_buckets=True):
     3. Retrieves the latest URL file containing movie data.
     4. Extracts movie IDs from the URL file.
     5. Fetches detailed movie information for the extracted IDs.
-    6. Inserts or updates the movie details in the database.
-    7. Reads the 'movie_details' table using a custom SQL query and writes the results to a file and Google Sheet.
-    8. Deletes temporary folders older than 30 days.
+    6. Inserts or updates the movie details in the database and refreshes the 'movie_aggregates' table.
+    7. Reads the 'movie_details' and 'movie_aggregates' tables and writes the results to files and Google Sheets.
+    8. Compacts the folders of past days into indexed archives and deletes folders older than 30 days.
     9. Optionally uploads files to a remote storage bucket.
     10. Cleans up the local temporary directory.
+    In incremental mode, steps 3 to 6 instead consume every links file not yet recorded in the links manifest,
+    fetch only movies that were never seen before and upsert them without rebuilding the table. The manifest
+    is saved once the upsert succeeds, and only the aggregate groups of the upserted movies are recomputed.
+    A full run resets the manifest to the movies it loaded, so a later incremental run reads every links file
+    again and restores the movies the rebuild dropped.
+    If mirror_images is True, posters and backdrops that were never mirrored are downloaded, resized and uploaded
+    to the bucket before step 7. Mirror URLs recorded by earlier runs are copied to 'movie_details' either way.
+    Unless force is True, the function only runs the housekeeping of step 8 and exits if the links files (by ETag),
+    the genres loaded by the genres job and the run options are the same as in the last successful run.
+    In profile mode, the select statements of step 7 are profiled and a query_profile.json report is written
+    with the other files.
     Args:
         write_files_to_buckets (bool, optional): If True, uploads generated files to a remote storage bucket. Defaults to True.
+        incremental (bool, optional): If True, ingests all unprocessed links files incrementally. Defaults to False.
+        profile (bool, optional): If True, profiles the select statements and writes a profile report. Defaults to False.
+        time_budget_ms (int, optional): The maximum execution time of each select statement in milliseconds. Defaults to no limit.
+        mirror_images (bool, optional): If True, mirrors new posters and backdrops to the bucket. Defaults to False.
+        force (bool, optional): If True, runs in full even if the links files did not change. Defaults to False.
     """
 
+    job = "movie_details_incremental" if incremental else "movie_details"
+    run_inputs = {
+        "links": filebase.get_links_fingerprint_inputs(all_files=incremental),
+        # the exported sheet joins on the genres table
+        "genres": filebase.get_last_run("genres").get("fingerprint"),
+        "options": {
+            "write_files_to_buckets": write_files_to_buckets,
+            "profile": profile,
+            "time_budget_ms": time_budget_ms,
+            "mirror_images": mirror_images,
+        },
+    }
+    fingerprint = filebase.get_fingerprint(run_inputs)
+    if not force and filebase.is_unchanged_since_last_run(job, fingerprint):
+        print("Nothing changed upstream, skipping the run...")
+        filebase.compact_past_days()
+        filebase.delete_folder_30days()
+        return None
+
     filebase.create_local_tmp()
-    conn = mysqldb.get_mysql_conn()
-    url_file = filebase.get_latest_url_file()
-    movie_ids = tmdb.get_movies_from_urls(url_file)
-    movie_library = tmdb.get_movie_library(movie_ids)
-    insert_status = mysqldb.insert_into_movie_details(
-        conn, movie_library, leave_open=True
-    )
+    conn = mysqldb.get_mysql_conn(read_timeout=mysqldb.get_read_timeout(time_budget_ms, profile))
+    if incremental:
+        manifest = filebase.load_links_manifest()
+        url_files = filebase.get_unprocessed_url_files(manifest)
+        movie_ids = tmdb.get_new_movies_from_urls(
+            [url_file["file_path"] for url_file in url_files], set(manifest["seen"])
+        )
+        movie_library = tmdb.get_movie_library(movie_ids)
+        changed_ids = [movie["id"] for movie in movie_library or []]
+        dimension_keys = mysqldb.get_movie_dimension_keys(conn, changed_ids)
+        insert_status = mysqldb.upsert_into_movie_details(
+            conn, movie_library, leave_open=True
+        )
+        dimension_keys |= mysqldb.get_movie_dimension_keys(conn, changed_ids)
+        if insert_status != "Failed":
+            manifest["processed_files"].update({url_file["key"]: url_file["etag"] for url_file in url_files})
+            manifest["seen"].extend(f"{mov['type']}/{mov['id']}" for mov in movie_ids)
+            filebase.save_links_manifest(manifest)
+    else:
+        url_file = filebase.get_latest_url_file()
+        movie_ids = tmdb.get_movies_from_urls(url_file)
+        movie_library = tmdb.get_movie_library(movie_ids)
+        insert_status = mysqldb.insert_into_movie_details(
+            conn, movie_library, leave_open=True
+        )
+        dimension_keys = None
+        if movie_library and insert_status != "Failed":
+            # the table was rebuilt from the newest file only, so the manifest must forget everything else
+            filebase.save_links_manifest(
+                {
+                    "processed_files": {},
+                    "seen": [f"{mov['type']}/{mov['id']}" for mov in movie_ids],
+                }
+            )
 
     print("Insert status: ", insert_status)
 
+    aggregate_status = mysqldb.refresh_movie_aggregates(conn, dimension_keys, leave_open=True)
+    print("Aggregate status: ", aggregate_status)
+
+    mirrored_images = []
+    if mirror_images:
+        try:
+            mirrored_images = images.mirror_images(mysqldb.get_unmirrored_image_paths(conn))
+        except Exception as e:
+            print(f"Failed to mirror images: {e}")
+    mirror_status = mysqldb.apply_image_mirrors(conn, mirrored_images, leave_open=True)
+    print("Image mirror status: ", mirror_status)
+
+    profiles = [] if profile else None
+
     print("Reading 'movie_details' table...")
 
     select_movie_details_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "select_from_movie_details.sql")
     result = mysqldb.select_from_table(
-        conn, select_movie_details_path, write_to_file=True, write_to_gsheet=True
+        conn,
+        select_movie_details_path,
+        leave_open=True,
+        write_to_file=True,
+        write_to_gsheet=True,
+        profiles=profiles,
+        time_budget_ms=time_budget_ms,
+    )
+
+    print("Reading 'movie_aggregates' table...")
+
+    select_movie_aggregates_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "select_from_movie_aggregates.sql")
+    mysqldb.select_from_table(
+        conn,
+        select_movie_aggregates_path,
+        write_to_file=True,
+        write_to_gsheet=True,
+        sheet_name=constants.AGGREGATES_SHEET_NAME,
+        clear_gsheet=True,
+        profiles=profiles,
+        time_budget_ms=time_budget_ms,
     )
+
+    if profile:
+        mysqldb.write_profile_report(profiles)
     
+    filebase.compact_past_days()
     filebase.delete_folder_30days()
 
     if write_files_to_buckets:
@@ -47,6 +150,26 @@ def main(write_files_to_buckets=True):
 
     filebase.local_tmp_cleanup()
 
+    if insert_status != "Failed" and result is not None:
+        filebase.save_run_fingerprint(job, fingerprint, run_inputs)
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="ingest every unprocessed links file and fetch only movies not seen before",
+    )
+    parser.add_argument("--profile", action="store_true", help="profile the select statements and write a profile report")
+    parser.add_argument("--time-budget", type=int, help="abort select statements running longer than this many milliseconds")
+    parser.add_argument("--mirror-images", action="store_true", help="mirror new posters and backdrops to the bucket")
+    parser.add_argument("--force", action="store_true", help="run in full even if the links files did not change")
+    args = parser.parse_args()
+    main(
+        incremental=args.incremental,
+        profile=args.profile,
+        time_budget_ms=args.time_budget,
+        mirror_images=args.mirror_images,
+        force=args.force,
+    )
@@ -1,19 +1,87 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 import constants
 import os
+import io
+import gzip
+import hashlib
+import json
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import re
 
 
+COMPRESSION_EXTENSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+# members with these extensions are stored as-is in daily archives
+PRECOMPRESSED_EXTENSIONS = (".gz", ".zst", ".xlsx")
+# prefixes written by the pipelines themselves, never holding uploaded links files
+MANAGED_PREFIXES = (
+    constants.LINKS_MANIFEST_KEY.split("/")[0] + "/",
+    constants.IMAGE_MIRROR_PREFIX + "/",
+)
+
+
+def get_s3_client():
+    """
+    Creates an S3 client for the Filebase bucket using the credentials from the constants module.
+
+    :return: A boto3 S3 client
+    """
+    return boto3.client(
+        "s3",
+        endpoint_url=constants.S3_ENDPOINT_URL,
+        aws_access_key_id=constants.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=constants.AWS_SECRET_ACCESS_KEY,
+    )
+
+
+def is_source_links_file(object_name):
+    """
+    Checks whether an object is a links file uploaded to the bucket, as opposed to a copy the pipelines wrote.
+
+    A links file is a text file with 'link' in its name. Copies under a YYYYMMDD/ prefix (uploaded by
+    upload_to_folder() from the local directory) and objects under the manifest or image prefixes are excluded.
+
+    :param object_name: The S3 object key
+    :return: True if the object is a source links file, otherwise False
+    """
+    if object_name[-4:] != ".txt" or "link" not in object_name.lower():
+        return False
+    if re.match(r"^\d{8}/", object_name) or object_name.startswith(MANAGED_PREFIXES):
+        return False
+    return True
+
+
+def _compressed_writer(raw, compression):
+    """
+    Wraps a binary file object so that everything written to it is compressed on the fly.
+
+    :param raw: A writable binary file object
+    :param compression: One of None, "gzip" or "zstd"
+    :return: A writable binary file object; closing it flushes the compressor but leaves raw open
+    """
+    if compression is None:
+        return raw
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb")
+    if compression == "zstd":
+        # only reachable if zstandard is installed, see constants.ARTIFACT_COMPRESSION
+        import zstandard
+
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
 def get_latest_url_file():
 
     """
     Retrieves the latest URL file from the S3 bucket and saves it locally.
 
     Connects to the S3 bucket using credentials from the constants module.
-    Lists all objects in the specified bucket, sorts them by the last modified
-    date in descending order, and checks if the latest file is a text file
-    containing 'link' in its name. If so, it downloads the file to a local
+    Lists all objects in the specified bucket page by page, keeps the source
+    links files (see is_source_links_file()) and picks the one with the latest
+    last modified date, so mirrored images and the copies written by
+    upload_to_folder() never hide it. The file is downloaded to a local
     directory specified in constants.BASE_FILE_PATH with a timestamp appended
     to the file name. Returns the local file path if successful, otherwise
     returns None and prints a message if no suitable file is found.
@@ -21,23 +89,22 @@ def get_latest_url_file():
     :return: The local file path if successful, otherwise None
     """
 
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=constants.S3_ENDPOINT_URL,
-        aws_access_key_id=constants.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=constants.AWS_SECRET_ACCESS_KEY,
-    )
+    s3 = get_s3_client()
 
     file_path = None
-    res = s3.list_objects(Bucket=constants.BUCKET)["Contents"]
-    res.sort(key=lambda x: x["LastModified"], reverse=True)
-    object_name = res[0]["Key"]
+    latest = None
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=constants.BUCKET):
+        for obj in page.get("Contents", []):
+            if is_source_links_file(obj["Key"]) and (latest is None or obj["LastModified"] > latest["LastModified"]):
+                latest = obj
 
-    if object_name[-4:] == ".txt" and "link" in object_name.lower():
+    if latest is not None:
+        object_name = latest["Key"]
         file_name = (
             object_name[:-4]
             + "_"
-            + res[0]["LastModified"].strftime("%Y%m%d%H%M%S")
+            + latest["LastModified"].strftime("%Y%m%d%H%M%S")
             + ".txt"
         )
         file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), constants.BASE_FILE_PATH, file_name)
@@ -46,7 +113,7 @@ def get_latest_url_file():
             "Got the latest file: "
             + object_name
             + "; Last modified: "
-            + res[0]["LastModified"].strftime("%Y-%m-%d %H:%M:%S")
+            + latest["LastModified"].strftime("%Y-%m-%d %H:%M:%S")
         )
         print("Saving to: " + file_path)
 
@@ -168,3 +235,510 @@ def local_tmp_cleanup():
             except Exception as e:
                 print(f"Failed to delete {local_path}: {e}")
     return None
+
+
+def get_artifact_key(file_name, compression=constants.ARTIFACT_COMPRESSION):
+    """
+    Builds the S3 key of an artifact written today: the YYYYMMDD/ date prefix used by
+    upload_to_folder(), the file name and the compression extension.
+
+    :param file_name: The name of the artifact
+    :param compression: One of None, "gzip" or "zstd"
+    :return: The S3 key as a string
+    """
+    return datetime.now().date().strftime("%Y%m%d") + "/" + file_name + COMPRESSION_EXTENSIONS[compression]
+
+
+class MultipartUploadWriter(io.RawIOBase):
+    """
+    A writable binary file object that uploads everything written to it as an S3 multipart upload.
+
+    Bytes are buffered until constants.MULTIPART_CHUNKSIZE is reached and then sent as one part.
+    The object only becomes visible in the bucket once complete() is called. abort() discards the
+    parts uploaded so far.
+    """
+
+    def __init__(self, s3, s3_key):
+        self.s3 = s3
+        self.s3_key = s3_key
+        self.buffer = bytearray()
+        self.parts = []
+        self.upload_id = s3.create_multipart_upload(Bucket=constants.BUCKET, Key=s3_key)["UploadId"]
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.buffer.extend(b)
+        while len(self.buffer) >= constants.MULTIPART_CHUNKSIZE:
+            self.upload_part(bytes(self.buffer[:constants.MULTIPART_CHUNKSIZE]))
+            del self.buffer[:constants.MULTIPART_CHUNKSIZE]
+        return len(b)
+
+    def upload_part(self, body):
+        part_number = len(self.parts) + 1
+        response = self.s3.upload_part(
+            Bucket=constants.BUCKET,
+            Key=self.s3_key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        self.parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+
+    def complete(self):
+        # the last part may be smaller than the chunk size, and an empty artifact is a single empty part
+        if self.buffer or not self.parts:
+            self.upload_part(bytes(self.buffer))
+            self.buffer.clear()
+        self.s3.complete_multipart_upload(
+            Bucket=constants.BUCKET,
+            Key=self.s3_key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+
+    def abort(self):
+        try:
+            self.s3.abort_multipart_upload(Bucket=constants.BUCKET, Key=self.s3_key, UploadId=self.upload_id)
+        except Exception as e:
+            print(f"Failed to abort the upload of s3://{constants.BUCKET}/{self.s3_key}: {e}")
+
+
+@contextmanager
+def open_artifact_stream(file_name, compression=constants.ARTIFACT_COMPRESSION):
+    """
+    Opens a writable binary stream that is compressed and uploaded to the S3 bucket as bytes are written.
+
+    The object key is the current date prefix (YYYYMMDD/) followed by the file name and the
+    compression extension. Compressed bytes are sent as parts of a multipart upload, so nothing is
+    staged on local disk. The upload is only completed when the block exits normally; if the block
+    or the upload raises, the multipart upload is aborted and no partial object is left behind.
+
+    :param file_name: The name of the artifact, e.g. "insert_into_genres.sql"
+    :param compression: One of None, "gzip" or "zstd"
+    :return: A writable binary file object (as a context manager)
+    """
+    s3 = get_s3_client()
+    s3_key = get_artifact_key(file_name, compression)
+    upload = MultipartUploadWriter(s3, s3_key)
+
+    try:
+        writer = _compressed_writer(upload, compression)
+        yield writer
+        if writer is not upload:
+            writer.close()
+        upload.complete()
+    except BaseException:
+        upload.abort()
+        raise
+
+    print(f"Streamed {file_name} to s3://{constants.BUCKET}/{s3_key}")
+
+
+def write_artifact(file_name, data, compression=constants.ARTIFACT_COMPRESSION):
+    """
+    Uploads an artifact that is already held in memory to the S3 bucket, falling back to the local
+    directory specified in constants.BASE_FILE_PATH if the upload fails.
+
+    The content is compressed in memory and sent with upload_fileobj. Producers that generate their
+    output piece by piece should write to open_artifact_stream() instead.
+
+    :param file_name: The name of the artifact, e.g. "query_profile.json"
+    :param data: A string or bytes object with the artifact content
+    :param compression: One of None, "gzip" or "zstd"
+    :return: The S3 URI or the local file path the artifact was written to
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    s3_key = get_artifact_key(file_name, compression)
+
+    try:
+        buffer = io.BytesIO()
+        writer = _compressed_writer(buffer, compression)
+        writer.write(data)
+        if writer is not buffer:
+            writer.close()
+        buffer.seek(0)
+        s3 = get_s3_client()
+        s3.upload_fileobj(
+            buffer,
+            constants.BUCKET,
+            s3_key,
+            Config=TransferConfig(multipart_chunksize=constants.MULTIPART_CHUNKSIZE),
+        )
+        print(f"Uploaded {file_name} to s3://{constants.BUCKET}/{s3_key}")
+        return f"s3://{constants.BUCKET}/{s3_key}"
+    except Exception as e:
+        print(f"Failed to upload {file_name}: {e}")
+
+    return spool_artifact(file_name, data, compression)
+
+
+def spool_artifact(file_name, data, compression=constants.ARTIFACT_COMPRESSION):
+    """
+    Writes an artifact to the local directory specified in constants.BASE_FILE_PATH.
+
+    Used when an artifact could not be uploaded directly. Files spooled locally are picked up by
+    upload_to_folder() at the end of the run.
+
+    :param file_name: The name of the artifact, e.g. "insert_into_genres.sql"
+    :param data: A string or bytes object with the artifact content
+    :param compression: One of None, "gzip" or "zstd"
+    :return: The local file path the artifact was written to
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    local_path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        constants.BASE_FILE_PATH,
+        file_name + COMPRESSION_EXTENSIONS[compression],
+    )
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    with open(local_path, "wb") as raw:
+        writer = _compressed_writer(raw, compression)
+        writer.write(data)
+        if writer is not raw:
+            writer.close()
+    print(f"Spooled {file_name} to {local_path}")
+
+    return local_path
+
+
+def list_day_folders(s3):
+    """
+    Lists all objects in the S3 bucket whose key starts with a date in the format YYYYMMDD,
+    grouped by that date prefix.
+
+    :param s3: A boto3 S3 client
+    :return: A dictionary mapping each YYYYMMDD prefix to the list of object keys under it
+    """
+    day_folders = {}
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=constants.BUCKET):
+        for obj in page.get("Contents", []):
+            if not re.match(r"^\d{8}/", obj["Key"]):
+                continue
+            day_folders.setdefault(obj["Key"].split("/")[0], []).append(obj["Key"])
+    return day_folders
+
+
+def compact_day_folder(s3, day, keys):
+    """
+    Rolls all objects under a YYYYMMDD/ prefix into a single archive object with a JSON index.
+
+    Each member is appended to YYYYMMDD/<constants.ARCHIVE_FILE_NAME> as an independent blob:
+    files that are already compressed (.gz, .zst, .xlsx) are stored as-is, everything else is
+    gzipped. YYYYMMDD/<constants.ARCHIVE_INDEX_FILE_NAME> records the name, offset, length and
+    encoding of every member so a single artifact can be fetched with a ranged GET
+    (see get_archived_artifact). The original objects are deleted once both are uploaded.
+
+    If the day was compacted before, the existing archive members are carried over.
+
+    :param s3: A boto3 S3 client
+    :param day: The date prefix in the format YYYYMMDD
+    :param keys: The object keys under the date prefix
+    :return: The index as a dictionary
+    """
+    archive_key = f"{day}/{constants.ARCHIVE_FILE_NAME}"
+    index_key = f"{day}/{constants.ARCHIVE_INDEX_FILE_NAME}"
+    archive = io.BytesIO()
+    members = []
+
+    if index_key in keys and archive_key in keys:
+        archive.write(s3.get_object(Bucket=constants.BUCKET, Key=archive_key)["Body"].read())
+        members = json.loads(s3.get_object(Bucket=constants.BUCKET, Key=index_key)["Body"].read())["members"]
+
+    new_keys = [key for key in keys if key not in (archive_key, index_key)]
+    for key in sorted(new_keys):
+        body = s3.get_object(Bucket=constants.BUCKET, Key=key)["Body"].read()
+        encoding = "identity"
+        if not key.lower().endswith(PRECOMPRESSED_EXTENSIONS):
+            body = gzip.compress(body)
+            encoding = "gzip"
+        members.append(
+            {
+                "name": key[len(day) + 1:],
+                "offset": archive.tell(),
+                "length": len(body),
+                "encoding": encoding,
+            }
+        )
+        archive.write(body)
+
+    index = {"day": day, "members": members}
+    archive.seek(0)
+    s3.upload_fileobj(archive, constants.BUCKET, archive_key)
+    s3.put_object(
+        Bucket=constants.BUCKET,
+        Key=index_key,
+        Body=json.dumps(index).encode("utf-8"),
+        ContentType="application/json",
+    )
+
+    for i in range(0, len(new_keys), 1000):
+        s3.delete_objects(
+            Bucket=constants.BUCKET,
+            Delete={"Objects": [{"Key": key} for key in new_keys[i:i + 1000]], "Quiet": True},
+        )
+    print(f"Compacted {len(new_keys)} objects into s3://{constants.BUCKET}/{archive_key}")
+
+    return index
+
+
+def compact_past_days():
+    """
+    Compacts every YYYYMMDD/ prefix older than today into a single indexed archive.
+
+    Days that only contain the archive and its index are skipped, so the job is cheap to run
+    on every trigger. If compacting a day fails, an error message is printed and the day is
+    left untouched for the next run.
+
+    :return: None
+    """
+    s3 = get_s3_client()
+    today = datetime.now().date().strftime("%Y%m%d")
+    archive_names = {constants.ARCHIVE_FILE_NAME, constants.ARCHIVE_INDEX_FILE_NAME}
+
+    try:
+        day_folders = list_day_folders(s3)
+    except Exception as e:
+        print(f"Failed to list objects in s3://{constants.BUCKET}: {e}")
+        return None
+
+    for day, keys in sorted(day_folders.items()):
+        if day >= today:
+            continue
+        if all(key.split("/", 1)[1] in archive_names for key in keys):
+            print(f"Skipping {day}/ because it is already compacted")
+            continue
+        try:
+            compact_day_folder(s3, day, keys)
+        except Exception as e:
+            print(f"Failed to compact {day}/: {e}")
+
+    return None
+
+
+def get_archived_artifact(day, name):
+    """
+    Fetches a single artifact from a compacted day with a ranged GET on the archive.
+
+    :param day: The date prefix in the format YYYYMMDD
+    :param name: The artifact name relative to the date prefix, e.g. "insert_into_genres.sql.gz"
+    :return: The artifact content as bytes, exactly as it was originally uploaded, or None if not found
+    """
+    s3 = get_s3_client()
+    index_key = f"{day}/{constants.ARCHIVE_INDEX_FILE_NAME}"
+    index = json.loads(s3.get_object(Bucket=constants.BUCKET, Key=index_key)["Body"].read())
+
+    for member in index["members"]:
+        if member["name"] != name:
+            continue
+        if member["length"] == 0:
+            return b""
+        byte_range = f"bytes={member['offset']}-{member['offset'] + member['length'] - 1}"
+        body = s3.get_object(
+            Bucket=constants.BUCKET,
+            Key=f"{day}/{constants.ARCHIVE_FILE_NAME}",
+            Range=byte_range,
+        )["Body"].read()
+        if member["encoding"] == "gzip":
+            body = gzip.decompress(body)
+        return body
+
+    print(f"{name} not found in the archive for {day}")
+    return None
+
+
+def load_links_manifest():
+    """
+    Loads the manifest of processed links files and seen (type, id) pairs from the S3 bucket.
+
+    The manifest is stored as JSON under constants.LINKS_MANIFEST_KEY. If it does not exist yet,
+    an empty manifest is returned.
+
+    :return: A dictionary with keys "processed_files" (object key -> ETag) and "seen" (list of "type/id" strings)
+    """
+    s3 = get_s3_client()
+    try:
+        body = s3.get_object(Bucket=constants.BUCKET, Key=constants.LINKS_MANIFEST_KEY)["Body"].read()
+        manifest = json.loads(body)
+    except s3.exceptions.NoSuchKey:
+        print("Links manifest not found, starting a new one...")
+        manifest = {}
+
+    manifest.setdefault("processed_files", {})
+    manifest.setdefault("seen", [])
+    return manifest
+
+
+def save_links_manifest(manifest):
+    """
+    Saves the manifest of processed links files and seen (type, id) pairs to the S3 bucket.
+
+    :param manifest: A dictionary as returned by load_links_manifest()
+    :return: None
+    """
+    s3 = get_s3_client()
+    s3.put_object(
+        Bucket=constants.BUCKET,
+        Key=constants.LINKS_MANIFEST_KEY,
+        Body=json.dumps(manifest).encode("utf-8"),
+        ContentType="application/json",
+    )
+    print(f"Saved links manifest to s3://{constants.BUCKET}/{constants.LINKS_MANIFEST_KEY}")
+    return None
+
+
+def get_unprocessed_url_files(manifest):
+    """
+    Downloads every links file in the S3 bucket that is not recorded in the manifest.
+
+    Only source links files are considered (see is_source_links_file()). A file counts
+    as processed if the manifest holds the same key with the same ETag, so re-uploading a file with
+    new content picks it up again. Files are returned oldest first and saved to the local directory
+    specified in constants.BASE_FILE_PATH with their last modified timestamp appended.
+
+    :param manifest: A dictionary as returned by load_links_manifest()
+    :return: A list of dictionaries with keys "key", "etag" and "file_path"
+    """
+    s3 = get_s3_client()
+    url_files = []
+
+    candidates = []
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=constants.BUCKET):
+        for obj in page.get("Contents", []):
+            object_name = obj["Key"]
+            if not is_source_links_file(object_name):
+                continue
+            if manifest["processed_files"].get(object_name) == obj["ETag"]:
+                continue
+            candidates.append(obj)
+    candidates.sort(key=lambda x: x["LastModified"])
+
+    for obj in candidates:
+        object_name = obj["Key"]
+        file_name = (
+            os.path.basename(object_name)[:-4]
+            + "_"
+            + obj["LastModified"].strftime("%Y%m%d%H%M%S")
+            + ".txt"
+        )
+        file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), constants.BASE_FILE_PATH, file_name)
+        print(
+            "Got unprocessed file: "
+            + object_name
+            + "; Last modified: "
+            + obj["LastModified"].strftime("%Y-%m-%d %H:%M:%S")
+        )
+        with open(file_path, "wb") as f:
+            s3.download_fileobj(constants.BUCKET, object_name, f)
+        url_files.append({"key": object_name, "etag": obj["ETag"], "file_path": file_path})
+
+    if not url_files:
+        print("No unprocessed links files found")
+
+    return url_files
+
+
+def get_fingerprint(inputs):
+    """
+    Computes a stable fingerprint of the inputs of a run.
+
+    :param inputs: A JSON serializable object describing the inputs, e.g. ETags or API responses
+    :return: The SHA-256 hex digest of the canonical JSON of the inputs
+    """
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def get_links_fingerprint_inputs(all_files=False):
+    """
+    Lists the key and ETag of the links files in the S3 bucket without downloading them.
+
+    Only source links files count (see is_source_links_file()), so the copies a run uploads with
+    upload_to_folder() do not change the fingerprint of the next run.
+
+    :param all_files: A boolean indicating whether to return all links files (incremental ingestion) or only the newest one
+    :return: A dictionary mapping each links file key to its ETag
+    """
+    s3 = get_s3_client()
+    links_files = []
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=constants.BUCKET):
+        for obj in page.get("Contents", []):
+            if is_source_links_file(obj["Key"]):
+                links_files.append(obj)
+    links_files.sort(key=lambda x: x["LastModified"], reverse=True)
+    if not all_files:
+        links_files = links_files[:1]
+
+    return {obj["Key"]: obj["ETag"] for obj in links_files}
+
+
+def get_last_run(job):
+    """
+    Reads the record of the last successful run of a job.
+
+    The records are stored as JSON under constants.RUN_FINGERPRINTS_KEY.
+
+    :param job: The name of the job, e.g. "genres"
+    :return: A dictionary with keys "fingerprint", "inputs" and "finished_at", or an empty dictionary if there is none or it cannot be read
+    """
+    s3 = get_s3_client()
+    try:
+        body = s3.get_object(Bucket=constants.BUCKET, Key=constants.RUN_FINGERPRINTS_KEY)["Body"].read()
+        return json.loads(body).get(job, {})
+    except Exception as e:
+        print(f"Could not read run fingerprints: {e}")
+        return {}
+
+
+def is_unchanged_since_last_run(job, fingerprint):
+    """
+    Checks whether the last successful run of a job had the same input fingerprint.
+
+    If the last run cannot be read, the job is considered changed so that it runs in full.
+
+    :param job: The name of the job, e.g. "genres"
+    :param fingerprint: The fingerprint of the current inputs, see get_fingerprint()
+    :return: True if the inputs are unchanged, otherwise False
+    """
+    last_run = get_last_run(job)
+    if not last_run or last_run.get("fingerprint") != fingerprint:
+        return False
+    print(f"Inputs of '{job}' unchanged since the run finished at {last_run.get('finished_at')}")
+    return True
+
+
+def save_run_fingerprint(job, fingerprint, inputs):
+    """
+    Records the input fingerprint of a successful run of a job in the S3 bucket.
+
+    :param job: The name of the job, e.g. "genres"
+    :param fingerprint: The fingerprint of the inputs, see get_fingerprint()
+    :param inputs: A short description of the inputs, stored for troubleshooting
+    :return: None
+    """
+    s3 = get_s3_client()
+    try:
+        body = s3.get_object(Bucket=constants.BUCKET, Key=constants.RUN_FINGERPRINTS_KEY)["Body"].read()
+        fingerprints = json.loads(body)
+    except s3.exceptions.NoSuchKey:
+        fingerprints = {}
+
+    fingerprints[job] = {
+        "fingerprint": fingerprint,
+        "inputs": inputs,
+        "finished_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    s3.put_object(
+        Bucket=constants.BUCKET,
+        Key=constants.RUN_FINGERPRINTS_KEY,
+        Body=json.dumps(fingerprints, indent=2).encode("utf-8"),
+        ContentType="application/json",
+    )
+    print(f"Saved run fingerprint of '{job}' to s3://{constants.BUCKET}/{constants.RUN_FINGERPRINTS_KEY}")
+    return None
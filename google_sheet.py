@@ -10,7 +10,7 @@ SCOPES = constants.SCOPES
 SPREADSHEET_ID = constants.SPREADSHEET_ID
 SHEET_NAME = constants.SHEET_NAME
 
-def write_df_to_google_sheet(df):
+def write_df_to_google_sheet(df, sheet_name=SHEET_NAME, clear=False):
     """
     Writes a pandas DataFrame to a specified Google Sheet using the Sheets API.
     The function authenticates using either a service account file or Application Default Credentials (ADC) via Workload Identity Federation.
@@ -18,6 +18,9 @@ def write_df_to_google_sheet(df):
     with details about the update.
     Args:
         df (pandas.DataFrame): The DataFrame to write to the Google Sheet.
+        sheet_name (str, optional): The name of the target sheet within the spreadsheet. Defaults to SHEET_NAME.
+        clear (bool, optional): Whether to clear the whole sheet first, so that no rows or columns of a larger
+            earlier result are left behind. Defaults to False.
     Returns:
         str: A status message indicating the updated range, number of rows (including headers), and total cells updated.
     Raises:
@@ -47,9 +50,16 @@ def write_df_to_google_sheet(df):
         'values': values
     }
 
+    if clear:
+        google_sheet_service.spreadsheets().values().clear(
+                spreadsheetId=SPREADSHEET_ID,
+                range=sheet_name,
+                body={}
+        ).execute()
+
     result = google_sheet_service.spreadsheets().values().update(
             spreadsheetId=SPREADSHEET_ID,
-            range=f"{SHEET_NAME}!A1",
+            range=f"{sheet_name}!A1",
             valueInputOption='RAW',
             body=update_body
     ).execute()
@@ -0,0 +1,160 @@
+import constants
+import filebase
+import hashlib
+import io
+import json
+import os
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+
+def download_image(image_path):
+    """
+    Downloads a full resolution image from TMDb.
+
+    The image is fetched from constants.IMAGE_BASE_URL, which can be pointed to a local server
+    with the IMAGE_BASE_URL environment variable to run the pipeline offline.
+
+    :param image_path: The TMDb image path, e.g. "/abc123.jpg"
+    :return: The image content as bytes
+    """
+    with urllib.request.urlopen(constants.IMAGE_BASE_URL + image_path, timeout=constants.TIMEOUT) as response:
+        return response.read()
+
+
+def generate_variants(content, image_path):
+    """
+    Generates the resized variants of an image listed in constants.IMAGE_VARIANT_WIDTHS.
+
+    Variants are JPEGs scaled down to the configured width, keeping the aspect ratio. Images that
+    are already narrower than a variant are not upscaled. The untouched original is included under
+    "original" with the extension of the TMDb path.
+
+    :param content: The original image content as bytes
+    :param image_path: The TMDb image path, used for the extension of the original
+    :return: A dictionary mapping each file name (e.g. "w500.jpg") to its content as bytes
+    """
+    extension = os.path.splitext(image_path)[1].lower() or ".jpg"
+    variants = {"original" + extension: content}
+
+    image = Image.open(io.BytesIO(content))
+    image = image.convert("RGB")
+    for name, width in constants.IMAGE_VARIANT_WIDTHS.items():
+        variant = image
+        if image.width > width:
+            variant = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        buffer = io.BytesIO()
+        variant.save(buffer, format="JPEG", quality=85, optimize=True)
+        variants[name + ".jpg"] = buffer.getvalue()
+
+    return variants
+
+
+def is_mirrored(s3, prefix):
+    """
+    Checks whether an image was completely mirrored under the given prefix.
+
+    The marker object constants.IMAGE_MIRROR_MARKER is written after all variants, so a prefix left
+    half-written by an interrupted run is not considered mirrored.
+
+    :param s3: A boto3 S3 client
+    :param prefix: The S3 prefix of the image, see get_image_prefix()
+    :return: True if the marker exists, otherwise False
+    """
+    marker_key = f"{prefix}/{constants.IMAGE_MIRROR_MARKER}"
+    response = s3.list_objects_v2(Bucket=constants.BUCKET, Prefix=marker_key, MaxKeys=1)
+    return any(obj["Key"] == marker_key for obj in response.get("Contents", []))
+
+
+def upload_variants(s3, prefix, variants):
+    """
+    Uploads the variants of an image under the given prefix, followed by the marker object that
+    flags the image as completely mirrored.
+
+    :param s3: A boto3 S3 client
+    :param prefix: The S3 prefix of the image, see get_image_prefix()
+    :param variants: A dictionary as returned by generate_variants()
+    :return: None
+    """
+    for file_name, content in variants.items():
+        content_type = "image/png" if file_name.endswith(".png") else "image/jpeg"
+        s3.put_object(
+            Bucket=constants.BUCKET,
+            Key=f"{prefix}/{file_name}",
+            Body=content,
+            ContentType=content_type,
+            CacheControl="public, max-age=31536000, immutable",
+        )
+    s3.put_object(
+        Bucket=constants.BUCKET,
+        Key=f"{prefix}/{constants.IMAGE_MIRROR_MARKER}",
+        Body=json.dumps(sorted(variants)).encode("utf-8"),
+        ContentType="application/json",
+    )
+    return None
+
+
+def get_image_prefix(content_hash):
+    """
+    Builds the S3 prefix of a mirrored image from its content hash.
+
+    :param content_hash: The SHA-256 hex digest of the original image
+    :return: The S3 prefix as a string, e.g. "images/ab/ab12..."
+    """
+    return f"{constants.IMAGE_MIRROR_PREFIX}/{content_hash[:2]}/{content_hash}"
+
+
+def mirror_images(image_paths):
+    """
+    Mirrors TMDb posters and backdrops to the S3 bucket.
+
+    Images are downloaded concurrently with up to constants.IMAGE_WORKERS threads. Every image is
+    stored once per content hash, so identical images behind different TMDb paths share the same
+    variants. The recorded mirror URL points to the constants.IMAGE_MIRROR_DEFAULT_VARIANT JPEG; the
+    other variants live next to it. If an image fails to download or convert, an error message is
+    printed and it is left out of the result so the next run retries it.
+
+    :param image_paths: A list of TMDb image paths
+    :return: A list of dictionaries with keys "source_path", "content_hash" and "mirror_url"
+    """
+    image_paths = sorted({path for path in image_paths if path})
+    if not image_paths:
+        return []
+
+    s3 = filebase.get_s3_client()
+    mirror_base_url = constants.IMAGE_MIRROR_BASE_URL or f"{constants.S3_ENDPOINT_URL}/{constants.BUCKET}"
+    # one lock per content hash, so identical images are uploaded only once and no thread records a
+    # mirror URL before the upload of its variants has finished
+    hash_locks = {}
+    hash_locks_lock = threading.Lock()
+
+    def mirror(image_path):
+        try:
+            content = download_image(image_path)
+            content_hash = hashlib.sha256(content).hexdigest()
+            prefix = get_image_prefix(content_hash)
+
+            with hash_locks_lock:
+                hash_lock = hash_locks.setdefault(content_hash, threading.Lock())
+            with hash_lock:
+                if is_mirrored(s3, prefix):
+                    print(f"Skipping upload of {image_path} because its content is already mirrored")
+                else:
+                    upload_variants(s3, prefix, generate_variants(content, image_path))
+                    print(f"Mirrored {image_path} to s3://{constants.BUCKET}/{prefix}/")
+
+            return {
+                "source_path": image_path,
+                "content_hash": content_hash,
+                "mirror_url": f"{mirror_base_url.rstrip('/')}/{prefix}/{constants.IMAGE_MIRROR_DEFAULT_VARIANT}.jpg",
+            }
+        except Exception as e:
+            print(f"Failed to mirror {image_path}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=constants.IMAGE_WORKERS) as executor:
+        mirrored = list(executor.map(mirror, image_paths))
+
+    return [image for image in mirrored if image]
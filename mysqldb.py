@@ -1,11 +1,19 @@
 import constants
+import filebase
 import google_sheet
+import query_cache
 import os
-import codecs
+import io
+import re
+import json
+import math
+import queue
+import time
 import pymysql
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
-def get_mysql_conn():
+def get_mysql_conn(read_timeout=constants.TIMEOUT):
     # conn_str = f"mysql://{user}:{password}@{host}:{port}/{db}"
 
     """
@@ -21,6 +29,7 @@ def get_mysql_conn():
 
     Returns a pymysql connection object.
 
+    :param read_timeout: The number of seconds to wait for the server's response before the connection is closed, or None to wait indefinitely. Defaults to constants.TIMEOUT, see get_read_timeout() for long-running queries
     :return: A pymysql connection object
     """
     conn = pymysql.connect(
@@ -30,7 +39,7 @@ def get_mysql_conn():
         db=constants.DB,
         host=constants.HOST,
         password=constants.PASSWORD,
-        read_timeout=constants.TIMEOUT,
+        read_timeout=read_timeout,
         port=constants.PORT,
         user=constants.USER,
         write_timeout=constants.TIMEOUT,
@@ -39,6 +48,23 @@ def get_mysql_conn():
     return conn
 
 
+
+def get_read_timeout(time_budget_ms=None, profile=False):
+    """
+    Returns the read timeout for a connection that runs select statements with a time budget or profiling.
+
+    With the default read timeout of constants.TIMEOUT seconds, PyMySQL gives up on a query before a longer budget runs out, so the server never gets to abort it with error 3024. With a budget, the read timeout leaves constants.TIMEOUT seconds on top of it for the server's response. When profiling without a budget, queries are allowed to run to completion.
+
+    :param time_budget_ms: The maximum execution time of each query in milliseconds, or None
+    :param profile: A boolean indicating whether the queries are profiled
+    :return: The read timeout in seconds, or None for no limit
+    """
+    if time_budget_ms:
+        return math.ceil(time_budget_ms / 1000) + constants.TIMEOUT
+    if profile:
+        return None
+    return constants.TIMEOUT
+
 def generate_genres_table(conn, data, leave_open=False):
     """
     Connects to the MySQL database using the provided connection object, and creates a table called 'genres' with two columns - 'id' and 'name'.
@@ -117,6 +143,8 @@ def create_or_replace_movie_details_table(conn, leave_open=False):
         - vote_count (integer)
         - backdrop_path (string)
         - poster_path (string)
+        - backdrop_mirror_url (string)
+        - poster_mirror_url (string)
         - belongs_to_collection (string)
         - src_tag (string)
         - publication_id (integer)
@@ -152,7 +180,162 @@ def create_or_replace_movie_details_table(conn, leave_open=False):
             print("Connection closed...")
 
 
-def select_from_table(conn, select_query, leave_open=False, write_to_file=False, write_to_gsheet=True):
+def get_data_version(conn, select_sql):
+    """
+    Returns a token identifying the current state of every table a select statement reads.
+
+    The tables are the ones of the current database whose name appears in the statement, so the match may include a few extra tables. Views are resolved to the base tables they read (through information_schema.VIEW_TABLE_USAGE, recursively), because CHECKSUM TABLE returns NULL for a view. The token is built from CHECKSUM TABLE on each base table, so any insert, update or delete changes it, including updates that leave publication_id and the row count alone. Tables of other databases named directly in the statement are not tracked.
+
+    A ValueError is raised if a view reads a table of another database or a checksum comes back NULL, so that the caller skips the query cache instead of serving a stale result.
+
+    :param conn: A pymysql connection object
+    :param select_sql: A SQL select statement
+    :return: A string token
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT TABLE_NAME, TABLE_TYPE FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME"
+    )
+    table_types = {row["TABLE_NAME"]: row["TABLE_TYPE"] for row in cursor.fetchall()}
+    pending = [
+        name for name in table_types if re.search(r"\b" + re.escape(name) + r"\b", select_sql, re.IGNORECASE)
+    ]
+
+    view_usage = {}
+    if any(table_types[name] == "VIEW" for name in pending):
+        cursor.execute(
+            "SELECT VIEW_NAME, TABLE_SCHEMA, TABLE_NAME FROM information_schema.VIEW_TABLE_USAGE WHERE VIEW_SCHEMA = DATABASE()"
+        )
+        for row in cursor.fetchall():
+            view_usage.setdefault(row["VIEW_NAME"], []).append((row["TABLE_SCHEMA"], row["TABLE_NAME"]))
+        cursor.execute("SELECT DATABASE() AS db")
+        database = cursor.fetchone()["db"]
+
+    table_names = set()
+    resolved_views = set()
+    while pending:
+        name = pending.pop()
+        if table_types.get(name) != "VIEW":
+            table_names.add(name)
+            continue
+        if name in resolved_views:
+            continue
+        resolved_views.add(name)
+        for schema, table_name in view_usage.get(name, []):
+            if schema != database:
+                raise ValueError(f"View {name} reads {schema}.{table_name} of another database, which is not tracked")
+            pending.append(table_name)
+
+    if not table_names:
+        return "no-tables"
+
+    cursor.execute("CHECKSUM TABLE " + ", ".join(f"`{name}`" for name in sorted(table_names)))
+    checksums = cursor.fetchall()
+    if any(row["Checksum"] is None for row in checksums):
+        raise ValueError("CHECKSUM TABLE returned NULL for " + ", ".join(row["Table"] for row in checksums if row["Checksum"] is None))
+    return ";".join(f"{row['Table']}:{row['Checksum']}" for row in checksums)
+
+
+def get_session_status(cursor):
+    """
+    Reads the session status counters used to profile a query: bytes sent to the client and the handler read counters.
+
+    :param cursor: A pymysql cursor
+    :return: A dictionary mapping each status variable name to its integer value
+    """
+    cursor.execute(
+        "SHOW SESSION STATUS WHERE Variable_name = 'Bytes_sent' OR Variable_name LIKE 'Handler_read%'"
+    )
+    return {row["Variable_name"]: int(row["Value"]) for row in cursor.fetchall()}
+
+
+def execute_with_profile(cursor, select_sql, profile):
+    """
+    Executes a select statement and records how it performed in the given profile dictionary.
+
+    The profile should hold the query's "time_budget_ms" (or None). It is filled with whether the query went over that budget, the client-side wall time, the server-side execution time and rows examined from performance_schema (if it is readable), the bytes sent by the server and the number of rows returned. The query is then run again with EXPLAIN ANALYZE and its plan is added to the profile. If the query fails, the error is recorded before it is raised.
+
+    :param cursor: A pymysql cursor
+    :param select_sql: A SQL select statement
+    :param profile: A dictionary to fill with the profile of the query
+    :return: The result of the select statement as a list of dictionaries
+    """
+    profile_sql_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "select_last_statement_profile.sql")
+    with open(profile_sql_path, "r") as f:
+        profile_sql = f.read()
+
+    status_before = get_session_status(cursor)
+    start = time.perf_counter()
+    try:
+        cursor.execute(select_sql)
+        result = cursor.fetchall()
+    except Exception as e:
+        profile["seconds"] = round(time.perf_counter() - start, 3)
+        profile["error"] = str(e)
+        if profile.get("time_budget_ms"):
+            # 3024: the server aborted the query because it exceeded MAX_EXECUTION_TIME
+            profile["over_budget"] = bool(e.args) and e.args[0] == 3024
+        raise
+    profile["seconds"] = round(time.perf_counter() - start, 3)
+    if profile.get("time_budget_ms"):
+        profile["over_budget"] = profile["seconds"] * 1000 > profile["time_budget_ms"]
+    status_after = get_session_status(cursor)
+
+    profile["rows_returned"] = len(result)
+    profile["bytes_returned"] = status_after.get("Bytes_sent", 0) - status_before.get("Bytes_sent", 0)
+    profile["handler_reads"] = sum(
+        status_after[name] - status_before.get(name, 0) for name in status_after if name.startswith("Handler_read")
+    )
+
+    try:
+        cursor.execute(profile_sql)
+        statement = cursor.fetchone()
+        profile["server_seconds"] = float(statement["server_seconds"])
+        profile["rows_examined"] = int(statement["rows_examined"])
+    except Exception as e:
+        print(f"Could not read performance_schema, using handler reads as rows examined: {e}")
+        profile["server_seconds"] = None
+        profile["rows_examined"] = profile["handler_reads"]
+
+    try:
+        cursor.execute("EXPLAIN ANALYZE " + select_sql)
+        profile["explain_analyze"] = "\n".join(str(list(row.values())[0]) for row in cursor.fetchall())
+    except Exception as e:
+        profile["explain_analyze"] = f"EXPLAIN ANALYZE failed: {e}"
+
+    return result
+
+
+def write_profile_report(profiles, report_name="query_profile"):
+    """
+    Writes the profiles collected by select_from_table to a JSON report and streams it to the S3 bucket.
+
+    A one line summary of every query is also printed, flagging the queries that failed or went over their time budget.
+
+    :param profiles: A list of profile dictionaries
+    :param report_name: The name of the report without extension
+    :return: The S3 URI or the local file path the report was written to
+    """
+    for profile in profiles:
+        flag = ""
+        if profile.get("over_budget"):
+            flag = " OVER BUDGET"
+        if profile.get("error"):
+            flag = flag + " FAILED: " + profile["error"]
+        print(
+            f"{os.path.basename(profile['query'])}: {profile.get('seconds')}s client, "
+            f"{profile.get('server_seconds')}s server, {profile.get('rows_examined')} rows examined, "
+            f"{profile.get('rows_returned')} rows / {profile.get('bytes_returned')} bytes returned{flag}"
+        )
+
+    report = json.dumps({"profiles": profiles}, indent=2, default=str)
+    # left uncompressed so the report can be opened straight from the bucket
+    report_location = filebase.write_artifact(report_name + ".json", report, compression=None)
+    print("Wrote profile report: " + report_location)
+    return report_location
+
+
+def select_from_table(conn, select_query, leave_open=False, write_to_file=False, write_to_gsheet=True, sheet_name=None, clear_gsheet=False, use_cache=False, profiles=None, time_budget_ms=None):
     """
     Connects to the MySQL database using the provided connection object, and executes a select statement from the provided file path.
 
@@ -160,15 +343,26 @@ def select_from_table(conn, select_query, leave_open=False, write_to_file=False,
 
     If leave_open is False, the connection will be closed when the function is finished.
 
-    If write_to_file is True, the results will be written to an Excel file.
+    If write_to_file is True, the results will be written to an Excel file and streamed to the S3 bucket.
 
     If write_to_gsheet is True, the results will be written to a Google Sheet.
 
+    If profiles is a list, the query is profiled and its profile appended to it. Cache hits are recorded without a profile.
+
+    If time_budget_ms is set, the server aborts the query once it runs longer than that.
+
+    If use_cache is True, the result is looked up in the query cache first (see query_cache), keyed on the normalized SQL and get_data_version(), and stored there after a cache miss.
+
     :param conn: A pymysql connection object
     :param select_query: A file path to a SQL select statement
     :param leave_open: A boolean indicating whether to leave the connection open
     :param write_to_file: A boolean indicating whether to write the result to an Excel file
     :param write_to_gsheet: A boolean indicating whether to write the results to a Google Sheet. Defaults to True
+    :param sheet_name: The name of the sheet to write to. Defaults to constants.SHEET_NAME
+    :param clear_gsheet: A boolean indicating whether to clear the sheet before writing, so that rows of a larger earlier result do not linger
+    :param use_cache: A boolean indicating whether to serve the result from the query cache if neither the SQL nor the data changed since it was stored
+    :param profiles: A list to append the profile of the query to (see execute_with_profile), or None to skip profiling
+    :param time_budget_ms: The maximum execution time of the query in milliseconds, enforced by the server with MAX_EXECUTION_TIME
     :return: A pandas DataFrame containing the results of the select statement
     """
 
@@ -178,23 +372,47 @@ def select_from_table(conn, select_query, leave_open=False, write_to_file=False,
         select_sql = f.read()
 
     try:
-        cursor = conn.cursor()
-        cursor.execute(select_sql)
-        result = cursor.fetchall()
-        result_df = pd.DataFrame(result)
-
-        print("Got results from the select statement...")
+        cache_key = None
+        if use_cache:
+            try:
+                cache_key = query_cache.get_cache_key(select_sql, get_data_version(conn, select_sql))
+                result_df = query_cache.load_cached_result(cache_key)
+            except Exception as e:
+                print(e)
+                print("Could not determine the data version, skipping the query cache...")
+
+        profile = None
+        if profiles is not None:
+            profile = {"query": select_query, "time_budget_ms": time_budget_ms, "cached": result_df is not None}
+            profiles.append(profile)
+
+        if result_df is None:
+            cursor = conn.cursor()
+            cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (time_budget_ms or 0,))
+            if profile is not None:
+                result = execute_with_profile(cursor, select_sql, profile)
+            else:
+                cursor.execute(select_sql)
+                result = cursor.fetchall()
+            result_df = pd.DataFrame(result)
+
+            print("Got results from the select statement...")
+
+            if cache_key:
+                query_cache.store_result(cache_key, result_df)
 
         if write_to_file:
             xlsx_name = (
                 select_query.split(".")[0].split("\\")[-1].split("/")[-1] + ".xlsx"
             )
-            xlsx_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), constants.BASE_FILE_PATH, xlsx_name)
-            result_df.to_excel(xlsx_path, index=False)
-            print("Wrote to Excel file...")
+            xlsx_buffer = io.BytesIO()
+            result_df.to_excel(xlsx_buffer, index=False)
+            # xlsx is already a zip archive, compressing it again gains nothing
+            xlsx_location = filebase.write_artifact(xlsx_name, xlsx_buffer.getvalue(), compression=None)
+            print("Wrote to Excel file: " + xlsx_location)
         
         if write_to_gsheet:
-            gsheet_res = google_sheet.write_df_to_google_sheet(result_df)
+            gsheet_res = google_sheet.write_df_to_google_sheet(result_df, sheet_name or constants.SHEET_NAME, clear=clear_gsheet)
             print(gsheet_res)
 
     except Exception as e:
@@ -209,6 +427,169 @@ def select_from_table(conn, select_query, leave_open=False, write_to_file=False,
     return result_df
 
 
+def select_from_tables(select_queries, max_connections=4, use_cache=False, profiles=None, time_budget_ms=None):
+    """
+    Executes several select statements concurrently over a bounded set of connections.
+
+    At most max_connections connections are opened, and each one is reused by the queries that run on it, reconnecting first if an earlier query left it closed. A failing query prints its error and yields a None result with the error recorded, instead of stopping the batch.
+
+    All connections are closed when the function is finished.
+
+    :param select_queries: A list of file paths to SQL select statements
+    :param max_connections: The maximum number of connections to open at the same time
+    :param use_cache: A boolean indicating whether to use the query cache
+    :param profiles: A list to append the profile of every query to, or None to skip profiling
+    :param time_budget_ms: The maximum execution time of each query in milliseconds
+    :return: A list of dictionaries with keys "query", "result" (a pandas DataFrame or None), "rows", "seconds" and "error", in the order of select_queries
+    """
+    if not select_queries:
+        return []
+
+    connection_count = max(1, min(max_connections, len(select_queries)))
+    print(f"Opening {connection_count} connections...")
+    connections = queue.Queue()
+    for _ in range(connection_count):
+        connections.put(get_mysql_conn(read_timeout=get_read_timeout(time_budget_ms, profiles is not None)))
+
+    def run(select_query):
+        conn = connections.get()
+        error = None
+        start = time.perf_counter()
+        try:
+            # PyMySQL closes the connection after a read timeout or a lost connection, so an earlier failed query may have left it closed
+            conn.ping(reconnect=True)
+            result_df = select_from_table(
+                conn,
+                select_query,
+                leave_open=True,
+                write_to_gsheet=False,
+                use_cache=use_cache,
+                profiles=profiles,
+                time_budget_ms=time_budget_ms,
+            )
+            if result_df is None:
+                error = "query failed, see the log above"
+        except Exception as e:
+            print(f"{select_query} failed: {e}")
+            result_df = None
+            error = str(e)
+        finally:
+            connections.put(conn)
+        seconds = time.perf_counter() - start
+        print(f"{select_query} took {seconds:.3f}s")
+        return {
+            "query": select_query,
+            "result": result_df,
+            "rows": None if result_df is None else len(result_df),
+            "seconds": round(seconds, 3),
+            "error": error,
+        }
+
+    try:
+        with ThreadPoolExecutor(max_workers=connection_count) as executor:
+            results = list(executor.map(run, select_queries))
+    finally:
+        print("Closing connections...")
+        while not connections.empty():
+            connections.get().close()
+        print("Connections closed...")
+
+    return results
+
+
+def get_result_names(results, max_length=None, reserved=("timings",)):
+    """
+    Derives a unique output name for every result of select_from_tables from its SQL file name.
+
+    Names are compared case-insensitively, optionally truncated to max_length, and suffixed with _2, _3, ... when two queries share a file name (e.g. a/x.sql and b/x.sql) or a name is reserved.
+
+    :param results: A list of dictionaries as returned by select_from_tables
+    :param max_length: The maximum length of a name, or None for no limit
+    :param reserved: Names that must not be used, e.g. the timings output
+    :return: A list of names in the order of results
+    """
+    names = []
+    used_names = {name.lower() for name in reserved}
+    for res in results:
+        base_name = os.path.splitext(os.path.basename(res["query"]))[0][:max_length]
+        name = base_name
+        suffix = 1
+        while name.lower() in used_names:
+            suffix += 1
+            name = base_name[:None if max_length is None else max_length - len(str(suffix)) - 1] + "_" + str(suffix)
+        used_names.add(name.lower())
+        names.append(name)
+    return names
+
+
+def get_timings_df(results, names):
+    """
+    Builds the timings table of a batch of queries.
+
+    :param results: A list of dictionaries as returned by select_from_tables
+    :param names: The output names of the results, see get_result_names
+    :return: A pandas DataFrame with one row per query
+    """
+    return pd.DataFrame(
+        [
+            {"name": name, "query": res["query"], "rows": res["rows"], "seconds": res["seconds"], "error": res["error"]}
+            for name, res in zip(names, results)
+        ]
+    )
+
+
+def write_results_to_workbook(results, workbook_name):
+    """
+    Writes the results of select_from_tables to a single Excel workbook with one sheet per query and a 'timings' sheet, and streams it to the S3 bucket.
+
+    Sheet names are the SQL file names, truncated to Excel's 31 character limit and made unique.
+
+    :param results: A list of dictionaries as returned by select_from_tables
+    :param workbook_name: The name of the workbook without extension
+    :return: The S3 URI or the local file path the workbook was written to
+    """
+    xlsx_buffer = io.BytesIO()
+    sheet_names = get_result_names(results, max_length=31)
+    with pd.ExcelWriter(xlsx_buffer, engine="openpyxl") as writer:
+        for sheet_name, res in zip(sheet_names, results):
+            result_df = res["result"] if res["result"] is not None else pd.DataFrame()
+            result_df.to_excel(writer, sheet_name=sheet_name, index=False)
+        get_timings_df(results, sheet_names).to_excel(writer, sheet_name="timings", index=False)
+
+    xlsx_location = filebase.write_artifact(workbook_name + ".xlsx", xlsx_buffer.getvalue(), compression=None)
+    print("Wrote to Excel file: " + xlsx_location)
+    return xlsx_location
+
+
+def write_results_to_parquet(results, prefix):
+    """
+    Writes the results of select_from_tables to one Parquet file per query plus a timings file, and streams them to the S3 bucket.
+
+    File names are the SQL file names, made unique in the same way as the sheet names of write_results_to_workbook.
+
+    :param results: A list of dictionaries as returned by select_from_tables
+    :param prefix: The folder name the files are written under
+    :return: A list of the S3 URIs or local file paths the files were written to
+    """
+    locations = []
+    names = get_result_names(results)
+    frames = [(name, res["result"]) for name, res in zip(names, results)]
+    frames.append(("timings", get_timings_df(results, names)))
+
+    for name, result_df in frames:
+        if result_df is None:
+            print(f"Skipping {name} because the query failed")
+            continue
+        parquet_buffer = io.BytesIO()
+        result_df.to_parquet(parquet_buffer, index=False, compression="zstd")
+        # Parquet pages are already compressed
+        location = filebase.write_artifact(f"{prefix}/{name}.parquet", parquet_buffer.getvalue(), compression=None)
+        print("Wrote to Parquet file: " + location)
+        locations.append(location)
+
+    return locations
+
+
 def insert_into_movie_details(conn, movie_library, leave_open=False):
     """
     Inserts a list of movie dictionaries into the 'movie_details' table of a MySQL database using the provided connection object.
@@ -262,41 +643,291 @@ def insert_into_movie_details(conn, movie_library, leave_open=False):
     return response
 
 
-def dict_list_to_insert_str(data, table, cols):
+def upsert_into_movie_details(conn, movie_library, leave_open=False):
+    """
+    Inserts or updates a list of movie dictionaries in the 'movie_details' table without dropping it.
+
+    Used for incremental ingestion: the table is created if it doesn't exist, new movies are inserted and movies that are already present are updated in place.
+
+    If the leave_open parameter is False, the connection will be closed when the function is finished.
+
+    :param conn: A pymysql connection object
+    :param movie_library: A list of dictionaries containing the movie details
+    :param leave_open: A boolean indicating whether to leave the connection open
+    :return: A string indicating whether the upsert statement was successful or not
+    """
+    if not movie_library:
+        if not leave_open:
+            print("Closing connection...")
+            conn.close()
+            print("Connection closed...")
+        return "Nothing to insert..."
+
+    table_name = "movie_details"
+    print("Generating upsert statement...")
+    update_cols = [col for col in constants.COLUMNS if col != "id"]
+    upsert_sql = dict_list_to_insert_str(movie_library, table_name, constants.COLUMNS, update_cols=update_cols)
+
+    response = "Failed"
+
+    try:
+        cursor = conn.cursor()
+        ddl = ""
+        create_movie_details_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "create_table_movie_details.sql")
+        with open(create_movie_details_path, "r") as f:
+            ddl = f.read()
+        cursor.execute(ddl.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1))
+        print("Executing upsert statement...")
+        cursor.execute(upsert_sql)
+        response = "Success\n" + str(cursor.rowcount) + " rows affected"
+    except Exception as e:
+        print(e)
+
+    finally:
+        conn.commit()
+        if not leave_open:
+            print("Closing connection...")
+            conn.close()
+            print("Connection closed...")
+
+    return response
+
+
+def get_movie_dimension_keys(conn, movie_ids):
+    """
+    Returns the aggregate groups the given movies currently belong to.
+
+    The groups are read from sql/select_movie_dimensions.sql, which maps every movie to its genres, original_language, release decade and collection.
+
+    :param conn: A pymysql connection object
+    :param movie_ids: A list of movie IDs
+    :return: A set of (dimension, dimension_value) tuples
+    """
+    if not movie_ids:
+        return set()
+
+    dimensions_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "select_movie_dimensions.sql")
+    with open(dimensions_path, "r") as f:
+        dimensions_sql = f.read().strip().rstrip(";")
+
+    keys = set()
+    try:
+        cursor = conn.cursor()
+        id_placeholders = ", ".join(["%s"] * len(movie_ids))
+        cursor.execute(
+            f"SELECT DISTINCT dimension, dimension_value FROM ({dimensions_sql}) d WHERE d.id IN ({id_placeholders})",
+            list(movie_ids),
+        )
+        keys = {(row["dimension"], row["dimension_value"]) for row in cursor.fetchall()}
+    except Exception as e:
+        # movie_details doesn't exist yet, so the movies don't belong to any group
+        print(e)
+
+    return keys
+
+
+def refresh_movie_aggregates(conn, dimension_keys=None, leave_open=False):
+    """
+    Maintains the 'movie_aggregates' table with counts, runtime, vote and popularity stats by genre, original_language, release decade and collection.
+
+    If dimension_keys is None, the whole table is rebuilt. Otherwise only the given (dimension, dimension_value) groups are recomputed from 'movie_details', so an incremental run only touches the groups of the movies that changed. Groups that no longer have any movie are removed.
+
+    If leave_open is False, the connection will be closed when the function is finished.
+
+    :param conn: A pymysql connection object
+    :param dimension_keys: A set of (dimension, dimension_value) tuples to recompute, or None to rebuild everything
+    :param leave_open: A boolean indicating whether to leave the connection open
+    :return: A string indicating whether the refresh was successful or not
+    """
+    sql_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql")
+    with open(os.path.join(sql_dir, "create_table_movie_aggregates.sql"), "r") as f:
+        ddl = f.read()
+    with open(os.path.join(sql_dir, "select_movie_dimensions.sql"), "r") as f:
+        dimensions_sql = f.read().strip().rstrip(";")
+
+    aggregate_sql = (
+        "INSERT INTO movie_aggregates (dimension, dimension_value, movie_count, total_runtime, avg_runtime, "
+        "min_runtime, max_runtime, avg_vote_average, min_vote_average, max_vote_average, total_vote_count, "
+        "avg_popularity, publication_id) "
+        "SELECT d.dimension, d.dimension_value, COUNT(*), SUM(m.runtime), AVG(m.runtime), MIN(m.runtime), "
+        "MAX(m.runtime), AVG(m.vote_average), MIN(m.vote_average), MAX(m.vote_average), SUM(m.vote_count), "
+        f"AVG(m.popularity), MAX(m.publication_id) FROM ({dimensions_sql}) d JOIN movie_details m ON m.id = d.id"
+    )
+    params = []
+    if dimension_keys is None:
+        delete_sql = "DELETE FROM movie_aggregates"
+    else:
+        dimension_keys = sorted(dimension_keys)
+        key_placeholders = ", ".join(["(%s, %s)"] * len(dimension_keys))
+        key_filter = f"(dimension, dimension_value) IN ({key_placeholders})"
+        delete_sql = f"DELETE FROM movie_aggregates WHERE {key_filter}"
+        aggregate_sql = aggregate_sql + f" WHERE (d.dimension, d.dimension_value) IN ({key_placeholders})"
+        params = [value for key in dimension_keys for value in key]
+    aggregate_sql = aggregate_sql + " GROUP BY d.dimension, d.dimension_value"
+
+    response = "Failed"
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(ddl)
+        if dimension_keys is not None and not dimension_keys:
+            response = "Nothing to refresh..."
+        else:
+            print("Refreshing 'movie_aggregates' table...")
+            cursor.execute(delete_sql, params or None)
+            cursor.execute(aggregate_sql, params or None)
+            response = "Success\n" + str(cursor.rowcount) + " groups refreshed"
+    except Exception as e:
+        print(e)
+
+    finally:
+        conn.commit()
+        if not leave_open:
+            print("Closing connection...")
+            conn.close()
+            print("Connection closed...")
+
+    return response
+
+
+def get_unmirrored_image_paths(conn):
+    """
+    Returns the poster and backdrop paths in the 'movie_details' table that are not in the 'image_mirrors' table yet.
+
+    :param conn: A pymysql connection object
+    :return: A list of TMDb image paths
+    """
+    sql_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql")
+    with open(os.path.join(sql_dir, "create_table_image_mirrors.sql"), "r") as f:
+        ddl = f.read()
+
+    cursor = conn.cursor()
+    cursor.execute(ddl)
+    cursor.execute(
+        "SELECT DISTINCT p.image_path FROM ("
+        "SELECT poster_path AS image_path FROM movie_details "
+        "UNION SELECT backdrop_path AS image_path FROM movie_details"
+        ") p LEFT JOIN image_mirrors i ON i.source_path = p.image_path "
+        "WHERE p.image_path IS NOT NULL AND p.image_path <> '' AND i.source_path IS NULL"
+    )
+    return [row["image_path"] for row in cursor.fetchall()]
+
+
+def apply_image_mirrors(conn, mirrored_images, leave_open=False):
+    """
+    Records mirrored images in the 'image_mirrors' table and copies their URLs to the 'movie_details' table.
+
+    It is cheap enough to run on every load even when no new image was mirrored. The 'image_mirrors' table outlives rebuilds of 'movie_details', so images that were mirrored once are never downloaded again. The mirror URL columns of 'movie_details' are added if the table was created before they existed, and refreshed for every movie, so movies whose poster or backdrop changed point to the right mirror.
+
+    If leave_open is False, the connection will be closed when the function is finished.
+
+    :param conn: A pymysql connection object
+    :param mirrored_images: A list of dictionaries with keys "source_path", "content_hash" and "mirror_url"
+    :param leave_open: A boolean indicating whether to leave the connection open
+    :return: A string indicating whether the update was successful or not
+    """
+    response = "Failed"
+    create_image_mirrors_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "create_table_image_mirrors.sql")
+    with open(create_image_mirrors_path, "r") as f:
+        ddl = f.read()
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(ddl)
+        if mirrored_images:
+            cursor.executemany(
+                "INSERT INTO image_mirrors (source_path, content_hash, mirror_url) VALUES (%s, %s, %s) "
+                "ON DUPLICATE KEY UPDATE content_hash = VALUES(content_hash), mirror_url = VALUES(mirror_url)",
+                [(image["source_path"], image["content_hash"], image["mirror_url"]) for image in mirrored_images],
+            )
+            print(f"Recorded {len(mirrored_images)} mirrored images...")
+
+        cursor.execute(
+            "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'movie_details' AND COLUMN_NAME LIKE '%_mirror_url'"
+        )
+        existing_columns = {row["COLUMN_NAME"] for row in cursor.fetchall()}
+        for column in ["backdrop_mirror_url", "poster_mirror_url"]:
+            if column not in existing_columns:
+                print(f"Adding column '{column}' to 'movie_details'...")
+                cursor.execute(f"ALTER TABLE movie_details ADD COLUMN {column} VARCHAR(255)")
+
+        cursor.execute(
+            "UPDATE movie_details m "
+            "LEFT JOIN image_mirrors p ON p.source_path = m.poster_path "
+            "LEFT JOIN image_mirrors b ON b.source_path = m.backdrop_path "
+            "SET m.poster_mirror_url = p.mirror_url, m.backdrop_mirror_url = b.mirror_url"
+        )
+        response = "Success\n" + str(cursor.rowcount) + " movies updated"
+    except Exception as e:
+        print(e)
+
+    finally:
+        conn.commit()
+        if not leave_open:
+            print("Closing connection...")
+            conn.close()
+            print("Connection closed...")
+
+    return response
+
+
+def row_to_values_str(val, cols):
+    """
+    Formats one dictionary as the parenthesized VALUES tuple of an SQL insert statement.
+
+    :param val: A dictionary containing the row to be inserted
+    :param cols: A list of strings representing the column names
+    :return: A string like "('a', 1)"
+    """
+    vals_str = "("
+    for col in cols:
+        try:
+            if val[col] == None:
+                vals_str = vals_str + "'', "
+            else:
+                vals_str = vals_str + "'" + val[col] + "', "
+        except TypeError as e:
+            vals_str = vals_str + str(val[col]) + ", "
+    return vals_str[:-2] + ")"
+
+
+def dict_list_to_insert_str(data, table, cols, update_cols=None):
     """
     Takes in a list of dictionaries, a table name, and a list of column names, and returns a string representing an SQL insert statement for the given table.
 
-    The function also writes the insert statement to a file in the directory specified in constants.BASE_FILE_PATH.
+    If update_cols is given, the statement is an upsert: it ends with an ON DUPLICATE KEY UPDATE clause for those columns and is written as upsert_into_<table>.sql instead of insert_into_<table>.sql.
+
+    The function also streams the compressed statement to the S3 bucket while it is being generated (see filebase.open_artifact_stream). If streaming fails, the statement is spooled to the directory specified in constants.BASE_FILE_PATH instead.
 
     :param data: A list of dictionaries containing the data to be inserted into the table
     :param table: A string representing the table name
     :param cols: A list of strings representing the column names
+    :param update_cols: A list of strings representing the columns to update when the row already exists, or None for a plain insert
     :return: A string representing the insert statement
     """
     cols_str = ", ".join(cols)
-    insert_str = f"INSERT INTO {table} ({cols_str}) VALUES "
-    vals_str = ""
-    for val in data:
-        vals_str = vals_str + "("
-        for col in cols:
-            try:
-                if val[col] == None:
-                    vals_str = vals_str + "'', "
-                else:
-                    vals_str = vals_str + "'" + val[col] + "', "
-            except TypeError as e:
-                vals_str = vals_str + str(val[col]) + ", "
-        vals_str = vals_str[:-2] + "), "
-    vals_str = vals_str[:-2]
-    insert_str = insert_str + vals_str
-    insert_file_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), constants.BASE_FILE_PATH, f"insert_into_{table}.sql"
-    )
-    with codecs.open(insert_file_path, "w", "utf-8") as f:
-        f.write(insert_str)
-        print(
-            f"Insert statement written to file: {os.path.join(constants.BASE_FILE_PATH, f'insert_into_{table}.sql')}"
-        )
+    insert_head = f"INSERT INTO {table} ({cols_str}) VALUES "
+    insert_tail = ""
+    file_name = f"insert_into_{table}.sql"
+    if update_cols:
+        insert_tail = " ON DUPLICATE KEY UPDATE " + ", ".join(f"{col} = VALUES({col})" for col in update_cols)
+        file_name = f"upsert_into_{table}.sql"
+    rows = []
+    try:
+        with filebase.open_artifact_stream(file_name) as f:
+            f.write(insert_head.encode("utf-8"))
+            for val in data:
+                rows.append(row_to_values_str(val, cols))
+                f.write(((", " if len(rows) > 1 else "") + rows[-1]).encode("utf-8"))
+            f.write(insert_tail.encode("utf-8"))
+        insert_location = f"s3://{constants.BUCKET}/{filebase.get_artifact_key(file_name)}"
+        insert_str = insert_head + ", ".join(rows) + insert_tail
+    except Exception as e:
+        print(f"Failed to stream {file_name}: {e}")
+        rows.extend(row_to_values_str(val, cols) for val in data[len(rows):])
+        insert_str = insert_head + ", ".join(rows) + insert_tail
+        insert_location = filebase.spool_artifact(file_name, insert_str)
+    print(f"Insert statement written to file: {insert_location}")
 
     return insert_str
-
@@ -0,0 +1,143 @@
+import constants
+import hashlib
+import os
+import re
+import pandas as pd
+
+
+# string literals are matched first so that comments and whitespace inside them are kept as-is;
+# like MySQL, -- only starts a comment when it is followed by whitespace
+SQL_TOKEN_PATTERN = re.compile(
+    r"('(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"|`[^`]*`)"
+    r"|((?:\s+|--(?=\s|$)[^\n]*|#[^\n]*|/\*.*?\*/)+)",
+    re.DOTALL,
+)
+
+
+def get_cache_path():
+    """
+    Returns the local directory specified in constants.QUERY_CACHE_PATH, creating it if it does not exist.
+
+    :return: The absolute path of the cache directory
+    """
+    cache_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), constants.QUERY_CACHE_PATH)
+    os.makedirs(cache_path, exist_ok=True)
+    return cache_path
+
+
+def normalize_sql(sql):
+    """
+    Normalizes a SQL statement so that formatting-only changes map to the same cache entry.
+
+    Comments are removed, runs of whitespace are collapsed to a single space and trailing
+    semicolons are dropped. String literals and quoted identifiers are left untouched.
+
+    :param sql: A SQL statement
+    :return: The normalized SQL statement
+    """
+
+    def replace(match):
+        if match.group(1):
+            return match.group(1)
+        return " "
+
+    return SQL_TOKEN_PATTERN.sub(replace, sql).strip().rstrip(";").strip()
+
+
+def get_cache_key(sql, data_version):
+    """
+    Builds the cache key for a query from its normalized SQL and the current data version.
+
+    :param sql: A SQL statement
+    :param data_version: A string identifying the state of the underlying tables, see mysqldb.get_data_version()
+    :return: A hex digest to be used as the cache entry name
+    """
+    digest = hashlib.sha256()
+    digest.update(normalize_sql(sql).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(data_version.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_cached_result(cache_key):
+    """
+    Loads a cached query result.
+
+    The entry's modification time is refreshed on a hit so that evict_cache() removes the least
+    recently used entries first.
+
+    :param cache_key: A key as returned by get_cache_key()
+    :return: A pandas DataFrame, or None if the entry does not exist or cannot be read
+    """
+    entry_path = os.path.join(get_cache_path(), cache_key + ".parquet")
+    if not os.path.exists(entry_path):
+        return None
+
+    try:
+        result_df = pd.read_parquet(entry_path)
+    except Exception as e:
+        print(f"Failed to read cache entry {entry_path}: {e}")
+        return None
+
+    try:
+        os.utime(entry_path)
+    except FileNotFoundError:
+        pass
+    print(f"Cache hit: {entry_path}")
+    return result_df
+
+
+def store_result(cache_key, result_df):
+    """
+    Stores a query result in the cache as a Parquet file and evicts old entries if the cache
+    grows beyond constants.QUERY_CACHE_MAX_BYTES.
+
+    :param cache_key: A key as returned by get_cache_key()
+    :param result_df: A pandas DataFrame containing the query result
+    :return: The path of the cache entry, or None if it could not be written
+    """
+    entry_path = os.path.join(get_cache_path(), cache_key + ".parquet")
+    try:
+        result_df.to_parquet(entry_path, index=False, compression="zstd")
+    except Exception as e:
+        print(f"Failed to write cache entry {entry_path}: {e}")
+        if os.path.exists(entry_path):
+            os.remove(entry_path)
+        return None
+
+    print(f"Cached result: {entry_path}")
+    evict_cache()
+    return entry_path
+
+
+def evict_cache(max_bytes=constants.QUERY_CACHE_MAX_BYTES):
+    """
+    Deletes the least recently used cache entries until the cache fits in max_bytes.
+
+    :param max_bytes: The maximum total size of the cache directory in bytes
+    :return: None
+    """
+    cache_path = get_cache_path()
+    entries = []
+    for file in os.listdir(cache_path):
+        entry_path = os.path.join(cache_path, file)
+        try:
+            if os.path.isfile(entry_path):
+                stat = os.stat(entry_path)
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+        except FileNotFoundError:
+            # evicted by another thread in the meantime
+            continue
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, entry_path in sorted(entries):
+        if total_size <= max_bytes:
+            break
+        try:
+            os.remove(entry_path)
+            total_size -= size
+            print(f"Evicted cache entry {entry_path}")
+        except Exception as e:
+            print(f"Failed to evict {entry_path}: {e}")
+
+    return None
@@ -1,41 +1,114 @@
 import mysqldb
-import sys
 import filebase
+import google_sheet
 import os
+import glob
+import argparse
 
-def main():
+def main(sql_files, use_cache=True, output_format="xlsx", output_name=None, max_connections=4, profile=False, time_budget_ms=None, write_to_gsheet=None):
     """
-    Connects to the MySQL database using the connection object returned by mysqldb.get_mysql_conn(), and executes a select statement defined in a file.
+    Connects to the MySQL database and executes one or more select statements defined in files.
 
-    The function takes in a file name of a SQL select statement as a command line argument. The file should be in the "sql" folder present in current directory
+    The function takes in file names or glob patterns of SQL select statements as command line arguments. The files should be in the "sql" folder present in current directory
 
-    If the select statement fails to execute, an error message will be printed with details of the error.
+    The queries run concurrently over at most max_connections connections. The results are written either to one workbook with a sheet per query, or to one Parquet file per query, together with the time each query took.
 
-    If the write_to_file parameter is True and the file fails to write, an error message will be printed with details of the error.
+    With --profile, every query that is not served from the cache is profiled (EXPLAIN ANALYZE, server-side time, rows examined and bytes returned) and a <output name>_profile.json report is written next to the results. With --time-budget, the server aborts any query running longer than the given number of milliseconds.
+
+    The result of a single query is also written to the Google Sheet, as before batches were supported; --gsheet does the same for the first of several queries and --no-gsheet turns it off.
+
+    Unless --no-cache is passed, the result is served from the query cache when neither the SQL nor the underlying tables changed since the last run.
+
+    If a file name or pattern matches no file, the function raises FileNotFoundError before connecting to the database.
+
+    If a select statement fails to execute, an error message will be printed with details of the error and the other queries still run.
 
     The function will return nothing.
 
+    :param sql_files: A list of file names or glob patterns of SQL select statements
+    :param use_cache: A boolean indicating whether to use the query cache. Defaults to True
+    :param output_format: Either "xlsx" for a single multi-sheet workbook or "parquet" for one file per query. Defaults to "xlsx"
+    :param output_name: The name of the workbook or Parquet folder. Defaults to the SQL file name for a single query and "custom_queries" otherwise
+    :param max_connections: The maximum number of database connections to open. Defaults to 4
+    :param profile: A boolean indicating whether to profile the queries and write a profile report. Defaults to False
+    :param time_budget_ms: The maximum execution time of each query in milliseconds. Defaults to no limit
+    :param write_to_gsheet: A boolean indicating whether to write the first result to the Google Sheet. Defaults to True for a single query and False otherwise
     :return: None
     """
 
+    sql_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql")
+    sql_paths = []
+    unmatched = []
+    for sql_file in sql_files:
+        matches = sorted(path for path in glob.glob(os.path.join(sql_dir, sql_file)) if os.path.isfile(path))
+        if not matches:
+            unmatched.append(sql_file)
+        sql_paths.extend(path for path in matches if path not in sql_paths)
+    if unmatched:
+        raise FileNotFoundError("No SQL file in " + sql_dir + " matches: " + ", ".join(unmatched))
+
     filebase.create_local_tmp()
-    sql_file = sys.argv[1]
-    sql_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", sql_file)
-    conn = mysqldb.get_mysql_conn()
-    result = mysqldb.select_from_table(conn, sql_path, write_to_file=True)
-    # print(result)
-    print(
-        "Result written to file "
-        + sql_file.split(".")[0].split("\\")[-1].split("/")[-1]
-        + ".xlsx"
+
+    if not output_name:
+        if len(sql_paths) == 1:
+            output_name = os.path.splitext(os.path.basename(sql_paths[0]))[0]
+        else:
+            output_name = "custom_queries"
+
+    profiles = [] if profile else None
+    results = mysqldb.select_from_tables(
+        sql_paths,
+        max_connections=max_connections,
+        use_cache=use_cache,
+        profiles=profiles,
+        time_budget_ms=time_budget_ms,
     )
 
-    print("Uploading the file to filebase bucket...")
-    filebase.upload_to_folder()
+    if output_format == "parquet":
+        mysqldb.write_results_to_parquet(results, output_name)
+    else:
+        mysqldb.write_results_to_workbook(results, output_name)
+
+    if write_to_gsheet is None:
+        write_to_gsheet = len(results) == 1
+    if write_to_gsheet and results[0]["result"] is not None:
+        try:
+            gsheet_res = google_sheet.write_df_to_google_sheet(results[0]["result"])
+            print(gsheet_res)
+        except Exception as e:
+            print(e)
 
+    if profile:
+        mysqldb.write_profile_report(profiles, output_name + "_profile")
+
+    # only uploads files that could not be streamed directly to the bucket
+    filebase.upload_to_folder()
 
-    mysqldb.local_tmp_cleanup()
+    filebase.local_tmp_cleanup()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sql_files", nargs="+", help="file names or glob patterns of SQL select statements in the sql folder")
+    parser.add_argument("--no-cache", action="store_true", help="always run the queries against the database")
+    parser.add_argument("--format", choices=["xlsx", "parquet"], default="xlsx", help="write one multi-sheet workbook or one Parquet file per query")
+    parser.add_argument("--output-name", help="name of the workbook or Parquet folder")
+    parser.add_argument("--connections", type=int, default=4, help="maximum number of concurrent database connections")
+    parser.add_argument("--profile", action="store_true", help="profile the queries and write a profile report")
+    parser.add_argument("--time-budget", type=int, help="abort queries running longer than this many milliseconds")
+    parser.add_argument("--gsheet", dest="gsheet", action="store_true", default=None, help="write the first result to the Google Sheet, the default for a single query")
+    parser.add_argument("--no-gsheet", dest="gsheet", action="store_false", help="do not write to the Google Sheet")
+    args = parser.parse_args()
+    try:
+        main(
+            args.sql_files,
+            use_cache=not args.no_cache,
+            output_format=args.format,
+            output_name=args.output_name,
+            max_connections=args.connections,
+            profile=args.profile,
+            time_budget_ms=args.time_budget,
+            write_to_gsheet=args.gsheet,
+        )
+    except FileNotFoundError as e:
+        parser.error(str(e))
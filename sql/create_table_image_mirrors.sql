@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS image_mirrors (
+    source_path VARCHAR(64) PRIMARY KEY,
+    content_hash CHAR(64) NOT NULL,
+    mirror_url VARCHAR(255) NOT NULL
+);
\ No newline at end of file
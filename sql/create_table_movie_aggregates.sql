@@ -0,0 +1,16 @@
+CREATE TABLE IF NOT EXISTS movie_aggregates (
+    dimension VARCHAR(32) NOT NULL,
+    dimension_value VARCHAR(144) NOT NULL,
+    movie_count INT UNSIGNED,
+    total_runtime INT UNSIGNED,
+    avg_runtime DECIMAL(16, 4),
+    min_runtime SMALLINT UNSIGNED,
+    max_runtime SMALLINT UNSIGNED,
+    avg_vote_average DECIMAL(16, 4),
+    min_vote_average DECIMAL(16, 4),
+    max_vote_average DECIMAL(16, 4),
+    total_vote_count BIGINT UNSIGNED,
+    avg_popularity DECIMAL(16, 4),
+    publication_id BIGINT UNSIGNED,
+    PRIMARY KEY (dimension, dimension_value)
+);
\ No newline at end of file
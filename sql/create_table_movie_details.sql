@@ -17,6 +17,8 @@ CREATE TABLE movie_details (
     vote_count INT UNSIGNED,
     backdrop_path VARCHAR(64),
     poster_path VARCHAR(64),
+    backdrop_mirror_url VARCHAR(255),
+    poster_mirror_url VARCHAR(255),
     belongs_to_collection VARCHAR(144),
     src_tag VARCHAR(128),
     publication_id BIGINT UNSIGNED
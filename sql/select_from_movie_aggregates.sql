@@ -0,0 +1,3 @@
+SELECT * FROM movie_aggregates
+ORDER BY dimension, movie_count DESC
+;
\ No newline at end of file
@@ -14,6 +14,8 @@ WITH movies AS (
 		vote_count,
 		backdrop_path,
 		poster_path,
+		backdrop_mirror_url,
+		poster_mirror_url,
 		belongs_to_collection,
 		publication_id,
 		genre_ids.genre_id,
@@ -44,6 +46,8 @@ movies_with_genre AS (
 		m.vote_count,
 		CONCAT('https://image.tmdb.org/t/p/original', m.backdrop_path) AS backdrop_path,
 		CONCAT('https://image.tmdb.org/t/p/original', m.poster_path) AS poster_path,
+		m.backdrop_mirror_url,
+		m.poster_mirror_url,
 		m.belongs_to_collection,
 		m.publication_id
 	FROM movies m
@@ -0,0 +1,8 @@
+SELECT TIMER_WAIT / 1000000000000 AS server_seconds,
+	ROWS_EXAMINED AS rows_examined,
+	ROWS_SENT AS rows_sent
+FROM performance_schema.events_statements_history
+WHERE THREAD_ID = PS_CURRENT_THREAD_ID()
+ORDER BY EVENT_ID DESC
+LIMIT 1 OFFSET 1
+;
\ No newline at end of file
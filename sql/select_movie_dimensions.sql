@@ -0,0 +1,31 @@
+SELECT m.id,
+	'genre' AS dimension,
+	g.name AS dimension_value
+FROM movie_details m
+JOIN JSON_TABLE(
+	m.genres,
+	'$[*]' COLUMNS (genre_id VARCHAR(50) PATH '$')
+) AS genre_ids
+JOIN genres g
+	ON genre_ids.genre_id = g.id
+UNION ALL
+SELECT id,
+	'original_language' AS dimension,
+	original_language AS dimension_value
+FROM movie_details
+WHERE original_language IS NOT NULL
+	AND original_language <> ''
+UNION ALL
+SELECT id,
+	'release_decade' AS dimension,
+	CONCAT(FLOOR(YEAR(release_date) / 10) * 10, 's') AS dimension_value
+FROM movie_details
+WHERE release_date IS NOT NULL
+UNION ALL
+SELECT id,
+	'collection' AS dimension,
+	belongs_to_collection AS dimension_value
+FROM movie_details
+WHERE belongs_to_collection IS NOT NULL
+	AND belongs_to_collection <> ''
+;
\ No newline at end of file
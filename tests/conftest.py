@@ -0,0 +1,99 @@
+import datetime
+import hashlib
+import io
+import os
+import sys
+import types
+
+import pytest
+
+# the modules live at the repository root and read their settings from the environment on import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AIVEN_DB_PORT", "3306")
+
+
+class FakeS3:
+    """An in-memory stand-in for the parts of the boto3 S3 client used by the pipelines."""
+
+    class NoSuchKey(Exception):
+        pass
+
+    def __init__(self):
+        self.objects = {}
+        self.put_keys = []
+        self.clock = datetime.datetime(2024, 1, 1)
+        self.exceptions = types.SimpleNamespace(NoSuchKey=FakeS3.NoSuchKey)
+
+    def _store(self, key, body):
+        self.clock += datetime.timedelta(seconds=1)
+        self.objects[key] = {
+            "Body": bytes(body),
+            "LastModified": self.clock,
+            "ETag": '"' + hashlib.md5(body).hexdigest() + '"',
+        }
+        self.put_keys.append(key)
+
+    def _listing(self, prefix=""):
+        return [
+            {"Key": key, "LastModified": obj["LastModified"], "ETag": obj["ETag"], "Size": len(obj["Body"])}
+            for key, obj in sorted(self.objects.items())
+            if key.startswith(prefix)
+        ]
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self._store(Key, Body)
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, **kwargs):
+        self._store(Key, Fileobj.read())
+
+    def upload_file(self, Filename, Bucket, Key, **kwargs):
+        with open(Filename, "rb") as f:
+            self._store(Key, f.read())
+
+    def download_fileobj(self, Bucket, Key, Fileobj, **kwargs):
+        Fileobj.write(self.objects[Key]["Body"])
+
+    def get_object(self, Bucket, Key, **kwargs):
+        if Key not in self.objects:
+            raise FakeS3.NoSuchKey(Key)
+        return {"Body": io.BytesIO(self.objects[Key]["Body"])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def list_objects(self, Bucket, Prefix="", MaxKeys=1000):
+        return {"Contents": self._listing(Prefix)[:MaxKeys]}
+
+    def list_objects_v2(self, Bucket, Prefix="", MaxKeys=1000):
+        contents = self._listing(Prefix)[:MaxKeys]
+        return {"KeyCount": len(contents), "Contents": contents}
+
+    def get_paginator(self, operation_name):
+        s3 = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix=""):
+                return [{"Contents": s3._listing(Prefix)}]
+
+        return Paginator()
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+    import constants
+    import filebase
+
+    s3 = FakeS3()
+    monkeypatch.setattr(filebase, "get_s3_client", lambda: s3)
+    monkeypatch.setattr(filebase.boto3, "client", lambda *args, **kwargs: s3)
+    monkeypatch.setattr(constants, "IMAGE_MIRROR_BASE_URL", "https://mirror.example")
+    return s3
+
+
+@pytest.fixture
+def local_tmp(tmp_path, monkeypatch):
+    import constants
+
+    # BASE_FILE_PATH is joined to the repository root, an absolute path takes precedence
+    monkeypatch.setattr(constants, "BASE_FILE_PATH", str(tmp_path))
+    return tmp_path
@@ -0,0 +1,39 @@
+import os
+
+import filebase
+
+
+def test_is_source_links_file():
+    assert filebase.is_source_links_file("movie_links.txt")
+    assert filebase.is_source_links_file("uploads/Movie_Links_2024.txt")
+    assert not filebase.is_source_links_file("movie_links.csv")
+    assert not filebase.is_source_links_file("notes.txt")
+    # copies written back by upload_to_folder() and objects managed by the pipelines
+    assert not filebase.is_source_links_file("20240101/movie_links_20240101120000.txt")
+    assert not filebase.is_source_links_file("manifests/links.txt")
+    assert not filebase.is_source_links_file("images/ab/links.txt")
+
+
+def test_get_unprocessed_url_files_skips_copies_and_processed_files(fake_s3, local_tmp):
+    fake_s3.put_object(Bucket="bucket", Key="old_links.txt", Body=b"movie/1")
+    fake_s3.put_object(Bucket="bucket", Key="new_links.txt", Body=b"movie/2")
+    fake_s3.put_object(Bucket="bucket", Key="20240101/new_links_20240101000002.txt", Body=b"movie/2")
+    manifest = {"processed_files": {"old_links.txt": fake_s3.objects["old_links.txt"]["ETag"]}, "seen": []}
+
+    url_files = filebase.get_unprocessed_url_files(manifest)
+
+    assert [url_file["key"] for url_file in url_files] == ["new_links.txt"]
+    with open(url_files[0]["file_path"], "rb") as f:
+        assert f.read() == b"movie/2"
+
+
+def test_get_latest_url_file_ignores_newer_managed_objects(fake_s3, local_tmp):
+    fake_s3.put_object(Bucket="bucket", Key="movie_links.txt", Body=b"movie/1")
+    fake_s3.put_object(Bucket="bucket", Key="images/ab/ab12/w500.jpg", Body=b"jpeg")
+    fake_s3.put_object(Bucket="bucket", Key="20240101/movie_links_20240101000001.txt", Body=b"movie/1")
+
+    file_path = filebase.get_latest_url_file()
+
+    assert os.path.basename(file_path).startswith("movie_links_")
+    with open(file_path, "rb") as f:
+        assert f.read() == b"movie/1"
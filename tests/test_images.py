@@ -0,0 +1,100 @@
+import http.server
+import io
+import threading
+
+import pytest
+from PIL import Image
+
+import constants
+import images
+
+
+def make_jpeg(width, height, color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def image_server(monkeypatch):
+    poster = make_jpeg(2000, 3000, (200, 10, 10))
+    backdrop = make_jpeg(3840, 2160, (10, 10, 200))
+    files = {"/poster.jpg": poster, "/poster_copy.jpg": poster, "/backdrop.jpg": backdrop}
+    requests = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path[len("/t/p/original"):]
+            requests.append(path)
+            if path not in files:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.end_headers()
+            self.wfile.write(files[path])
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(constants, "IMAGE_BASE_URL", f"http://127.0.0.1:{server.server_port}/t/p/original")
+    yield requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_generate_variants_scales_down_without_upscaling():
+    content = make_jpeg(800, 1200, (0, 128, 0))
+
+    variants = images.generate_variants(content, "/poster.jpg")
+
+    assert variants["original.jpg"] == content
+    sizes = {name: Image.open(io.BytesIO(data)).size for name, data in variants.items()}
+    assert sizes["w185.jpg"] == (185, 278)
+    assert sizes["w500.jpg"] == (500, 750)
+    assert sizes["w1280.jpg"] == (800, 1200)
+
+
+def test_mirror_images_dedupes_by_content_hash(image_server, fake_s3):
+    mirrored = images.mirror_images(["/poster.jpg", "/poster_copy.jpg", "/backdrop.jpg", "", None, "/missing.jpg"])
+
+    by_path = {image["source_path"]: image for image in mirrored}
+    assert sorted(by_path) == ["/backdrop.jpg", "/poster.jpg", "/poster_copy.jpg"]
+    assert by_path["/poster.jpg"]["content_hash"] == by_path["/poster_copy.jpg"]["content_hash"]
+    assert by_path["/poster.jpg"]["mirror_url"] == by_path["/poster_copy.jpg"]["mirror_url"]
+
+    poster_prefix = images.get_image_prefix(by_path["/poster.jpg"]["content_hash"])
+    assert by_path["/poster.jpg"]["mirror_url"] == f"https://mirror.example/{poster_prefix}/w500.jpg"
+    expected_files = ["original.jpg", "w185.jpg", "w500.jpg", "w1280.jpg", constants.IMAGE_MIRROR_MARKER]
+    assert sorted(key for key in fake_s3.put_keys if key.startswith(poster_prefix)) == sorted(
+        f"{poster_prefix}/{name}" for name in expected_files
+    )
+    # the poster is uploaded once although two paths point to it, and the marker comes last
+    assert len(fake_s3.put_keys) == 2 * len(expected_files)
+    assert fake_s3.put_keys[len(expected_files) - 1].endswith(constants.IMAGE_MIRROR_MARKER)
+
+
+def test_mirror_images_resumes_partially_mirrored_prefix(image_server, fake_s3):
+    first = images.mirror_images(["/poster.jpg"])
+    prefix = images.get_image_prefix(first[0]["content_hash"])
+    # simulate a run that died before writing the remaining variants and the marker
+    del fake_s3.objects[f"{prefix}/w1280.jpg"]
+    del fake_s3.objects[f"{prefix}/{constants.IMAGE_MIRROR_MARKER}"]
+
+    images.mirror_images(["/poster.jpg"])
+
+    assert f"{prefix}/w1280.jpg" in fake_s3.objects
+    assert f"{prefix}/{constants.IMAGE_MIRROR_MARKER}" in fake_s3.objects
+
+
+def test_mirror_images_skips_completely_mirrored_prefix(image_server, fake_s3):
+    images.mirror_images(["/poster.jpg"])
+    uploads = len(fake_s3.put_keys)
+
+    images.mirror_images(["/poster_copy.jpg"])
+
+    assert len(fake_s3.put_keys) == uploads
@@ -0,0 +1,27 @@
+import create_or_replace_movie_details
+import mysqldb
+import tmdb
+
+
+def test_identical_second_run_is_skipped(fake_s3, local_tmp, monkeypatch):
+    fake_s3.put_object(Bucket="bucket", Key="movie_links.txt", Body=b"https://www.themoviedb.org/movie/1")
+    fetches = []
+
+    def get_movies_from_urls(url_file):
+        fetches.append(url_file)
+        return [{"type": "movie", "id": 1}]
+
+    monkeypatch.setattr(tmdb, "get_movies_from_urls", get_movies_from_urls)
+    monkeypatch.setattr(tmdb, "get_movie_library", lambda movie_ids: [{"id": 1, "type": "movie"}])
+    monkeypatch.setattr(mysqldb, "get_mysql_conn", lambda read_timeout=None: object())
+    monkeypatch.setattr(mysqldb, "insert_into_movie_details", lambda conn, data, leave_open=False: "Inserted 1 rows")
+    monkeypatch.setattr(mysqldb, "refresh_movie_aggregates", lambda conn, keys, leave_open=False: "Refreshed")
+    monkeypatch.setattr(mysqldb, "apply_image_mirrors", lambda conn, mirrored, leave_open=False: "Nothing to apply")
+    monkeypatch.setattr(mysqldb, "select_from_table", lambda conn, query, **kwargs: [{"id": 1}])
+
+    create_or_replace_movie_details.main()
+    # the run uploads a dated copy of the links file, which must not count as an upstream change
+    assert any(key.startswith("20") and key.endswith(".txt") for key in fake_s3.objects)
+    create_or_replace_movie_details.main()
+
+    assert len(fetches) == 1
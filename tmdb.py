@@ -154,3 +154,26 @@ def get_movie_library(movie_ids):
     return movie_library
 
 
+def get_new_movies_from_urls(url_files, seen):
+    """
+    Given several files containing URLs, returns the movies that have not been seen before.
+
+    Each movie is tagged with the name of the first file it appears in. Movies appearing in more
+    than one file are only returned once.
+
+    :param url_files: A list of paths to files containing URLs, oldest first
+    :param seen: A set of "type/id" strings that were already processed
+    :return: A list of dictionaries with keys "id", "type", and "src_tag"
+    """
+    new_movies = []
+    new_keys = set()
+    for url_file in url_files:
+        for mov in get_movies_from_urls(url_file) or []:
+            key = f"{mov['type']}/{mov['id']}"
+            if key in seen or key in new_keys:
+                continue
+            new_keys.add(key)
+            new_movies.append(mov)
+
+    print(f"Found {len(new_movies)} new movies in {len(url_files)} files")
+    return new_movies